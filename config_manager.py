@@ -2,15 +2,101 @@
 Configuration Manager for Hallmark Record
 Handles loading and saving application configuration
 """
+import atexit
+import functools
 import json
 import os
+import threading
+import weakref
 from pathlib import Path
+from types import MappingProxyType
+
+# orjson is optional - fall back to the stdlib json module when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data):
+    """Serialize data to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temp file and os.replace
+    
+    The target is either the old or the new file, never a truncated one.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Don't leave a half-written temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _load_json(raw):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _freeze(value):
+    """Recursively wrap dicts in read-only proxies and turn lists into tuples"""
+    if value.__class__ is dict:
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if value.__class__ is list:
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_dir():
+    """Resolve (and create) the per-user config folder once per process"""
+    # Use AppData folder for user config
+    appdata = os.environ.get('APPDATA', os.path.expanduser('~'))
+    config_dir = os.path.join(appdata, 'Hallmark Record')
+    os.makedirs(config_dir, exist_ok=True)
+    return config_dir
+
+
+def _default_output_folder():
+    """Default recording output folder (user's Downloads folder)"""
+    return os.path.join(os.path.expanduser("~"), "Downloads", "Hallmark Record")
+
+
+def _is_enabled(destination):
+    """Filter predicate for enabled upload destinations"""
+    return destination.get('enabled', False)
+
+
+# Live managers, flushed once at interpreter shutdown. Weak references, so
+# registering for shutdown doesn't keep every instance alive until exit.
+_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    """Write pending changes of every live manager to disk"""
+    for manager in list(_managers):
+        manager.flush()
 
 
 class ConfigManager:
     """Manages application configuration"""
     
-    DEFAULT_CONFIG = {
+    # Read-only view; use default_config() for a mutable copy
+    DEFAULT_CONFIG = _freeze({
         "version": "1.0",
         "installation": {
             "output_folder": "",  # Will be set to user's Downloads folder
@@ -46,53 +132,108 @@ class ConfigManager:
             "log_level": "INFO",
             "check_for_updates": True
         }
-    }
+    })
+    
+    # Serialized once so fresh, fully independent default trees are cheap to build
+    _DEFAULT_TEMPLATE = json.dumps(DEFAULT_CONFIG, default=dict).encode()
+    
+    # Delay before settings changed via set() are written to disk (seconds)
+    SAVE_DELAY = 0.25
+    
+    # Parsed dot-notation key paths, shared by all instances
+    _path_cache = {}
     
     def __init__(self, config_path=None):
         """Initialize configuration manager"""
         if config_path is None:
-            # Use AppData folder for user config
-            appdata = os.environ.get('APPDATA', os.path.expanduser('~'))
-            config_dir = os.path.join(appdata, 'Hallmark Record')
-            os.makedirs(config_dir, exist_ok=True)
-            config_path = os.path.join(config_dir, 'config.json')
+            config_path = os.path.join(_default_config_dir(), 'config.json')
         
         self.config_path = config_path
-        self.config = self.load_config()
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        self._checked_output_folder = None  # Last output folder known to exist
+        
+        # Revision counter bumped on every change, used to memoize derived settings
+        self._rev = 0
+        self._watermark_cache = (None, None)
+        self._export_cache = (None, None)
+        
+        # Loaded lazily on first access, see the config property
+        self._config = None
+        
+        # Make sure pending changes reach disk on interpreter shutdown
+        _managers.add(self)
+    
+    @property
+    def config(self):
+        """Current configuration, loaded from disk on first access"""
+        config = self._config
+        if config is None:
+            config = self._config = self.load_config()
+        return config
+    
+    @config.setter
+    def config(self, value):
+        self._config = value
     
     def load_config(self):
         """Load configuration from file"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    return self.merge_with_defaults(config)
-            except Exception as e:
-                print(f"Error loading config: {e}")
-                return self.DEFAULT_CONFIG.copy()
-        else:
+        self._rev += 1
+        try:
+            # Read the whole (small) file at once and parse it in one go
+            with open(self.config_path, 'rb') as f:
+                config = _load_json(f.read())
+            # Merge with defaults to ensure all keys exist
+            if self.has_all_default_keys(config):
+                return config
+            return self.merge_with_defaults(config)
+        except FileNotFoundError:
             # Create default config
-            config = self.DEFAULT_CONFIG.copy()
-            # Set output folder to Downloads by default
-            config['installation']['output_folder'] = os.path.join(
-                os.path.expanduser("~"), "Downloads", "Hallmark Record"
-            )
+            config = self._build_defaults()
             self.save_config(config)
             return config
+        except Exception as e:
+            print(f"Error loading config: {e}")
+            return self.default_config()
+    
+    def default_config(self):
+        """Return a fresh deep copy of the default configuration"""
+        return json.loads(self._DEFAULT_TEMPLATE)
+    
+    def _build_defaults(self):
+        """Build a fresh first-run configuration with the output folder filled in"""
+        config = self.default_config()
+        config['installation']['output_folder'] = _default_output_folder()
+        return config
+    
+    def has_all_default_keys(self, config):
+        """Check whether a config written by this version already has every default key"""
+        defaults = self.DEFAULT_CONFIG
+        if config.get('version') != defaults['version'] or not config.keys() >= defaults.keys():
+            return False
+        for section, default_values in defaults.items():
+            if default_values.__class__ is MappingProxyType:
+                values = config[section]
+                if values.__class__ is not dict or not values.keys() >= default_values.keys():
+                    return False
+        return True
     
     def merge_with_defaults(self, config):
         """Merge loaded config with defaults to ensure all keys exist"""
-        def merge_dict(base, update):
-            result = base.copy()
-            for key, value in update.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = merge_dict(result[key], value)
-                else:
-                    result[key] = value
-            return result
+        result = self.default_config()
         
-        return merge_dict(self.DEFAULT_CONFIG.copy(), config)
+        # Merge in place with an explicit worklist; descend only where both sides are dicts
+        stack = [(result, config)]
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                current = dst.get(key)
+                if current.__class__ is dict and value.__class__ is dict:
+                    stack.append((current, value))
+                else:
+                    dst[key] = value
+        return result
     
     def save_config(self, config=None):
         """Save configuration to file"""
@@ -100,19 +241,51 @@ class ConfigManager:
             config = self.config
         
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            _write_atomic(self.config_path, _dump_json(config))
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
     
+    def flush(self):
+        """Write pending changes from set() to disk immediately"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            # set() mutates the config under the same lock, so it is serialized
+            # as a consistent snapshot; a failed save stays pending
+            if not self.save_config():
+                return False
+            self._dirty = False
+            return True
+    
+    def _schedule_save(self):
+        """Coalesce bursts of set() calls into a single delayed write"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _split_key_path(self, key_path):
+        """Split a dot-notation path into a cached tuple of keys"""
+        keys = self._path_cache.get(key_path)
+        if keys is None:
+            keys = tuple(key_path.split('.'))
+            self._path_cache[key_path] = keys
+        return keys
+    
     def get(self, key_path, default=None):
         """Get configuration value by dot-notation path
         
         Example: get('installation.output_folder')
         """
-        keys = key_path.split('.')
+        keys = self._split_key_path(key_path)
         value = self.config
         
         for key in keys:
@@ -125,41 +298,58 @@ class ConfigManager:
     
     def set(self, key_path, value):
         """Set configuration value by dot-notation path"""
-        keys = key_path.split('.')
-        config = self.config
-        
-        for key in keys[:-1]:
-            if key not in config:
-                config[key] = {}
-            config = config[key]
+        keys = self._split_key_path(key_path)
         
-        config[keys[-1]] = value
-        self.save_config()
+        # Under the save lock, so a flush never serializes a half-changed config
+        with self._save_lock:
+            config = self.config
+            for key in keys[:-1]:
+                if key not in config:
+                    config[key] = {}
+                config = config[key]
+            
+            config[keys[-1]] = value
+            self._rev += 1
+            if key_path == 'installation.output_folder':
+                self._checked_output_folder = None
+        self._schedule_save()
     
     def get_output_folder(self):
         """Get configured output folder"""
         folder = self.get('installation.output_folder')
         if not folder:
-            folder = os.path.join(os.path.expanduser("~"), "Downloads", "Hallmark Record")
+            folder = _default_output_folder()
             self.set('installation.output_folder', folder)
         
-        # Ensure folder exists
-        os.makedirs(folder, exist_ok=True)
+        # Ensure folder exists (once per configured path)
+        if folder != self._checked_output_folder:
+            os.makedirs(folder, exist_ok=True)
+            self._checked_output_folder = folder
         return folder
     
     def get_watermark_config(self):
-        """Get watermark configuration"""
-        return {
-            'enabled': self.get('watermark.enabled', False),
-            'image_path': self.get('watermark.image_path', ''),
-            'position': self.get('watermark.position', 'top_right'),
-            'opacity': self.get('watermark.opacity', 0.7)
-        }
+        """Get watermark configuration
+        
+        The returned dict is cached until the config changes - do not mutate it.
+        """
+        rev, cached = self._watermark_cache
+        if rev != self._rev:
+            cached = {
+                'enabled': self.get('watermark.enabled', False),
+                'image_path': self.get('watermark.image_path', ''),
+                'position': self.get('watermark.position', 'top_right'),
+                'opacity': self.get('watermark.opacity', 0.7)
+            }
+            self._watermark_cache = (self._rev, cached)
+        return cached
+    
+    def iter_enabled_upload_destinations(self):
+        """Iterate over enabled upload destinations without building a list"""
+        return filter(_is_enabled, self.get('upload.destinations', ()))
     
     def get_upload_destinations(self):
         """Get enabled upload destinations"""
-        destinations = self.get('upload.destinations', [])
-        return [d for d in destinations if d.get('enabled', False)]
+        return list(self.iter_enabled_upload_destinations())
     
     def add_upload_destination(self, destination):
         """Add a new upload destination"""
@@ -168,18 +358,24 @@ class ConfigManager:
         self.set('upload.destinations', destinations)
     
     def get_export_settings(self):
-        """Get export settings"""
-        return {
-            'quality': self.get('export.default_quality', 'medium'),
-            'format': self.get('export.export_format', 'mp4'),
-            'auto_export': self.get('export.auto_export_after_recording', False)
-        }
+        """Get export settings
+        
+        The returned dict is cached until the config changes - do not mutate it.
+        """
+        rev, cached = self._export_cache
+        if rev != self._rev:
+            cached = {
+                'quality': self.get('export.default_quality', 'medium'),
+                'format': self.get('export.export_format', 'mp4'),
+                'auto_export': self.get('export.auto_export_after_recording', False)
+            }
+            self._export_cache = (self._rev, cached)
+        return cached
     
     def export_config(self, output_path):
         """Export configuration to a file for deployment"""
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            _write_atomic(output_path, _dump_json(self.config))
             return True
         except Exception as e:
             print(f"Error exporting config: {e}")
@@ -188,11 +384,12 @@ class ConfigManager:
     def import_config(self, input_path):
         """Import configuration from a file"""
         try:
-            with open(input_path, 'r') as f:
-                imported_config = json.load(f)
+            with open(input_path, 'rb') as f:
+                imported_config = _load_json(f.read())
             
             # Merge with current config
             self.config = self.merge_with_defaults(imported_config)
+            self._rev += 1
             self.save_config()
             return True
         except Exception as e:
@@ -202,13 +399,21 @@ class ConfigManager:
 
 # Global config instance
 _config_manager = None
+_config_manager_lock = threading.Lock()
 
 def get_config_manager():
     """Get global configuration manager instance"""
     global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager
+    manager = _config_manager
+    if manager is not None:
+        return manager
+    
+    with _config_manager_lock:
+        if _config_manager is None:
+            # Only publish the instance once it is fully constructed
+            manager = ConfigManager()
+            _config_manager = manager
+        return _config_manager
 
 
 if __name__ == '__main__':
@@ -3,6 +3,15 @@ Detailed FFmpeg Device Diagnostic
 """
 import subprocess
 import os
+import re
+import sys
+import threading
+
+# Device names are quoted in FFmpeg's DirectShow listing (matched on raw bytes)
+DEVICE_NAME_RE = re.compile(rb'"([^"]+)"')
+
+# Seconds to wait for the device listing before treating FFmpeg as hung
+PROBE_TIMEOUT = 10
 
 ffmpeg_path = os.path.join(
     os.path.dirname(__file__),
@@ -22,61 +31,72 @@ print("=" * 70)
 
 try:
     command = [ffmpeg_path, "-list_devices", "true", "-f", "dshow", "-i", "dummy"]
-    result = subprocess.run(
+    proc = subprocess.Popen(
         command,
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='ignore',
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
     )
     
-    print("\n=== RAW FFMPEG OUTPUT ===")
-    print(result.stderr)
-    print("\n" + "=" * 70)
+    # Kill FFmpeg if it hangs so the diagnostic always finishes
+    timed_out = threading.Event()
+    
+    def kill_hung_probe():
+        timed_out.set()
+        proc.kill()
+    
+    watchdog = threading.Timer(PROBE_TIMEOUT, kill_hung_probe)
+    watchdog.start()
+    
+    try:
+        print("\n=== RAW FFMPEG OUTPUT ===")
+        sys.stdout.flush()
+        
+        # Echo and classify each stderr line as FFmpeg writes it, without decoding
+        video_devices = []
+        audio_devices = []
+        section = None
+        for line in proc.stderr:
+            sys.stdout.buffer.write(line)
+            
+            if b'DirectShow video devices' in line:
+                section = video_devices
+                continue
+            elif b'DirectShow audio devices' in line:
+                section = audio_devices
+                continue
+            
+            if section is not None and b'"' in line:
+                match = DEVICE_NAME_RE.search(line)
+                if match:
+                    section.append(match.group(1).decode('utf-8', 'ignore'))
+        proc.wait()
+    finally:
+        # Never leave a timer behind that could later kill a reused PID
+        watchdog.cancel()
+    sys.stdout.buffer.flush()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, PROBE_TIMEOUT)
     
-    # Parse the output
-    output = result.stderr
-    lines = output.split('\n')
+    print("\n" + "=" * 70)
     
     print("\n=== PARSED DEVICES ===\n")
     
     # Video devices
     print("VIDEO DEVICES:")
-    in_video_section = False
-    video_count = 0
-    for line in lines:
-        if 'DirectShow video devices' in line:
-            in_video_section = True
-            continue
-        elif 'DirectShow audio devices' in line:
-            in_video_section = False
-            
-        if in_video_section and '"' in line:
-            import re
-            match = re.search(r'"([^"]+)"', line)
-            if match:
-                video_count += 1
-                print(f"  {video_count}. {match.group(1)}")
+    video_count = len(video_devices)
+    for i, name in enumerate(video_devices, 1):
+        print(f"  {i}. {name}")
     
     if video_count == 0:
         print("  (none found)")
     
     # Audio devices
     print("\nAUDIO DEVICES:")
-    in_audio_section = False
-    audio_count = 0
-    for line in lines:
-        if 'DirectShow audio devices' in line:
-            in_audio_section = True
-            continue
-            
-        if in_audio_section and '"' in line:
-            import re
-            match = re.search(r'"([^"]+)"', line)
-            if match:
-                audio_count += 1
-                print(f"  {audio_count}. {match.group(1)}")
+    audio_count = len(audio_devices)
+    for i, name in enumerate(audio_devices, 1):
+        print(f"  {i}. {name}")
     
     if audio_count == 0:
         print("  (none found)")
@@ -96,6 +116,9 @@ try:
         print("- Try unplugging and reconnecting devices")
         print("- Close other apps that might be using the devices (Zoom, Teams, etc.)")
     
+except subprocess.TimeoutExpired:
+    print(f"\n❌ FFmpeg did not finish listing devices within {PROBE_TIMEOUT} seconds")
+    print("\nA device driver may be hanging. Try reconnecting your devices and run again.")
 except Exception as e:
     print(f"\n❌ Error running FFmpeg: {e}")
     print("\nMake sure FFmpeg is properly installed.")
@@ -4,17 +4,39 @@ Simple interface for editing recordings from multiple sources
 """
 import os
 import sys
+import re
 import json
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import functools
+import collections
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Optional
+import atexit
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, jsonify, send_from_directory, make_response
+from flask.json.provider import DefaultJSONProvider
 import subprocess
+import shlex
+from urllib.parse import quote
+from werkzeug.utils import safe_join
+from werkzeug.wsgi import FileWrapper
 import logging
 from datetime import datetime
+from pathlib import Path
 import time
 import psutil
 import win32gui
 import win32con
 import win32process
 
+# orjson is optional - fall back to Flask's stdlib json provider when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Determine template folder location (works for both script and PyInstaller bundle)
 if getattr(sys, 'frozen', False):
     # Running in PyInstaller bundle - templates are in _MEIPASS
@@ -24,6 +46,50 @@ else:
     template_folder = os.path.join(os.path.dirname(__file__), 'templates')
 
 app = Flask(__name__, template_folder=template_folder)
+
+# When running behind a web server, let it send preview files (zero-copy sendfile).
+# USE_X_SENDFILE=1 for Apache/lighttpd; X_ACCEL_PREFIX=/internal for an nginx internal location.
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+X_ACCEL_PREFIX = os.environ.get('X_ACCEL_PREFIX', '').rstrip('/')
+
+# Read size when Python itself streams a preview file
+PREVIEW_BLOCK_SIZE = 1024 * 1024
+
+# Largest request body the production server accepts (recording uploads)
+MAX_UPLOAD_BYTES = 16 * 1024 ** 3
+
+def _preview_file_wrapper(file, buffer_size=8192):
+    return FileWrapper(file, max(buffer_size, PREVIEW_BLOCK_SIZE))
+
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+        
+        def dumps_bytes(self, obj):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        
+        def dumps(self, obj, **kwargs):
+            return self.dumps_bytes(obj).decode('utf-8')
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+        
+        def response(self, *args, **kwargs):
+            # orjson already produces bytes - skip the str round trip
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+    
+    app.json = OrjsonProvider(app)
+
+def _json_bytes(obj):
+    """Encode obj to JSON bytes with the app's JSON provider"""
+    if orjson is not None:
+        return app.json.dumps_bytes(obj)
+    return app.json.dumps(obj).encode('utf-8')
+
+def _json_body_response(body):
+    """Wrap already-encoded JSON bytes in a response"""
+    return app.response_class(body, mimetype=app.json.mimetype)
 logging.basicConfig(level=logging.INFO)
 
 # Configuration - Save to user's Downloads folder
@@ -31,6 +97,24 @@ downloads = os.path.join(os.path.expanduser("~"), "Downloads")
 OUTPUTS_DIR = os.path.join(downloads, "Hallmark Record")
 FFMPEG_PATH = "ffmpeg"  # Will be resolved
 
+# Keep ffmpeg/ffprobe from flashing a console window on Windows
+_IS_WIN = os.name == 'nt'
+_CREATE_NO_WINDOW = subprocess.CREATE_NO_WINDOW if _IS_WIN else 0
+
+# Files shown in the session browser
+VIDEO_EXTS = ('.mp4',)
+AUDIO_EXTS = ('.wav', '.mp3')
+VIDEO_AUDIO_EXTS = VIDEO_EXTS + AUDIO_EXTS
+
+# Quoted audio device names in raw `ffmpeg -list_devices` output (one per line)
+_DSHOW_AUDIO_RE = re.compile(rb'"([^"\r\n]+)"[^\r\n]*\(audio\)', re.IGNORECASE)
+
+# First dshow audio device, cached by default_audio_device()
+_DEFAULT_AUDIO_DEVICE = None
+_DEFAULT_AUDIO_DEVICE_TS = 0
+DEFAULT_AUDIO_DEVICE_TTL = 300  # seconds
+
+@functools.lru_cache(maxsize=None)
 def find_ffmpeg():
     """Find ffmpeg executable"""
     # Determine the base path (works for both script and PyInstaller bundle)
@@ -58,6 +142,682 @@ def find_ffmpeg():
 
 FFMPEG_PATH = find_ffmpeg()
 
+# GPU decode for Intel/AMD on Windows (D3D11VA/DXVA2). 'auto' rather than a fixed
+# method so ffmpeg quietly falls back to software decoding when none initializes.
+_WIN_HWDECODE = ['-hwaccel', 'auto'] if _IS_WIN else []
+
+# H.264 encoder profiles, best first. 'decode' goes before each -i,
+# 'vopts' are the default encoder options and 'quality' maps export presets.
+ENCODER_PROFILES = {
+    'h264_nvenc': {
+        'vcodec': 'h264_nvenc',
+        'decode': ['-hwaccel', 'cuda'],
+        'vopts': ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'],
+        'quality': {
+            'high': ['-preset', 'p5', '-tune', 'hq', '-rc', 'vbr', '-cq', '19', '-b:v', '0'],
+            'medium': ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'],
+            'low': ['-preset', 'p2', '-tune', 'hq', '-rc', 'vbr', '-cq', '28', '-b:v', '0']
+        }
+    },
+    'h264_qsv': {
+        'vcodec': 'h264_qsv',
+        'decode': _WIN_HWDECODE,
+        'vopts': ['-preset', 'medium', '-global_quality', '23'],
+        'quality': {
+            'high': ['-preset', 'slow', '-global_quality', '19'],
+            'medium': ['-preset', 'medium', '-global_quality', '23'],
+            'low': ['-preset', 'fast', '-global_quality', '28']
+        }
+    },
+    'h264_amf': {
+        'vcodec': 'h264_amf',
+        'decode': _WIN_HWDECODE,
+        'vopts': ['-quality', 'balanced', '-rc', 'cqp', '-qp_i', '23', '-qp_p', '23'],
+        'quality': {
+            'high': ['-quality', 'quality', '-rc', 'cqp', '-qp_i', '19', '-qp_p', '19'],
+            'medium': ['-quality', 'balanced', '-rc', 'cqp', '-qp_i', '23', '-qp_p', '23'],
+            'low': ['-quality', 'speed', '-rc', 'cqp', '-qp_i', '28', '-qp_p', '28']
+        }
+    },
+    'h264_videotoolbox': {
+        'vcodec': 'h264_videotoolbox',
+        'decode': ['-hwaccel', 'videotoolbox'],
+        'vopts': ['-q:v', '60'],
+        'quality': {
+            'high': ['-q:v', '75'],
+            'medium': ['-q:v', '60'],
+            'low': ['-q:v', '45']
+        }
+    },
+    'libx264': {
+        'vcodec': 'libx264',
+        'decode': [],
+        'vopts': ['-preset', 'fast', '-crf', '23'],
+        'quality': {
+            'high': ['-crf', '18', '-preset', 'slow'],
+            'medium': ['-crf', '23', '-preset', 'medium'],
+            'low': ['-crf', '28', '-preset', 'fast']
+        }
+    }
+}
+
+def detect_hwaccel():
+    """Pick the best working H.264 encoder, falling back to libx264
+
+    Set HALLMARK_NO_GPU=1 to force software encoding.
+    """
+    if os.environ.get('HALLMARK_NO_GPU') == '1':
+        return ENCODER_PROFILES['libx264']
+
+    try:
+        result = subprocess.run(
+            [FFMPEG_PATH, '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f"Could not query FFmpeg encoders: {e}")
+        return ENCODER_PROFILES['libx264']
+
+    for name, profile in ENCODER_PROFILES.items():
+        if name == 'libx264' or name not in result.stdout:
+            continue
+        # Being compiled in doesn't mean the hardware is present - try a tiny encode
+        try:
+            probe = subprocess.run(
+                [FFMPEG_PATH, '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                 '-c:v', name, '-f', 'null', '-'],
+                capture_output=True,
+                timeout=10,
+                creationflags=_CREATE_NO_WINDOW
+            )
+        except Exception:
+            continue
+        if probe.returncode == 0:
+            logging.info(f"Using hardware encoder: {name}")
+            return profile
+
+    return ENCODER_PROFILES['libx264']
+
+HWACCEL = detect_hwaccel()
+
+def detect_cuda_filters():
+    """Check whether scale_cuda/overlay_cuda can be used alongside NVENC"""
+    if HWACCEL['vcodec'] != 'h264_nvenc':
+        return False
+    try:
+        result = subprocess.run(
+            [FFMPEG_PATH, '-hide_banner', '-filters'],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f"Could not query FFmpeg filters: {e}")
+        return False
+    return 'scale_cuda' in result.stdout and 'overlay_cuda' in result.stdout
+
+CUDA_FILTERS = detect_cuda_filters()
+# Decode straight into GPU memory so CUDA filters never copy frames back to the CPU
+CUDA_DECODE_ARGS = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+
+# Thread counts for encodes: one per physical core (hyperthreads just contend),
+# but a single CPU thread for NVENC, which parallelizes on the GPU itself
+_PHYS_CORES = str(psutil.cpu_count(logical=False) or os.cpu_count() or 2)
+FILTER_THREAD_ARGS = ['-filter_threads', _PHYS_CORES, '-filter_complex_threads', _PHYS_CORES]
+ENCODER_THREAD_ARGS = ['-threads', '1' if HWACCEL['vcodec'] == 'h264_nvenc' else _PHYS_CORES]
+
+# Constant argument chunks shared by the encode endpoints
+AAC_AUDIO_ARGS = ['-c:a', 'aac', '-b:a', '192k']
+MAP_VIDEO_AUDIO_ARGS = ['-map', '0:v:0', '-map', '1:a:0']  # video from input 0, audio from input 1
+# Full video encoder arguments per quality preset ('medium' for unknown presets)
+VIDEO_QUALITY_ARGS = {
+    quality: ['-c:v', HWACCEL['vcodec'], *opts, *ENCODER_THREAD_ARGS]
+    for quality, opts in HWACCEL['quality'].items()
+}
+
+def find_ffprobe():
+    """Find the ffprobe executable that ships next to ffmpeg"""
+    ffmpeg_dir, ffmpeg_name = os.path.split(FFMPEG_PATH)
+    ffprobe_path = os.path.join(ffmpeg_dir, ffmpeg_name.replace('ffmpeg', 'ffprobe'))
+    if ffmpeg_dir and not os.path.exists(ffprobe_path):
+        return "ffprobe"
+    return ffprobe_path
+
+FFPROBE_PATH = find_ffprobe()
+
+# ffprobe runs are I/O and process-startup bound, so probe several files at once
+PROBE_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='ffprobe')
+
+# Session folders are scanned concurrently so slow-disk / network share seeks overlap
+SCAN_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4), thread_name_prefix='scan')
+
+@functools.lru_cache(maxsize=256)
+def _probe_codec_cached(path, mtime, size):
+    """ffprobe the first video stream's codec; mtime and size only key the cache"""
+    try:
+        result = subprocess.run(
+            [FFPROBE_PATH, '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', path],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f"ffprobe failed for {path}: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+def probe_codec(path):
+    """Return the codec name of a file's first video stream, or None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _probe_codec_cached(path, st.st_mtime, st.st_size)
+
+# Stream properties that must match for the concat demuxer to copy safely
+STREAM_COPY_KEYS = ('codec_type', 'codec_name', 'profile', 'level', 'width', 'height',
+                    'pix_fmt', 'r_frame_rate', 'time_base', 'sample_rate', 'channels')
+
+@functools.lru_cache(maxsize=256)
+def _probe_streams_cached(path, mtime, size):
+    """ffprobe a file's stream layout as a hashable signature; mtime and size only key the cache"""
+    try:
+        result = subprocess.run(
+            [FFPROBE_PATH, '-v', 'error', '-show_streams', '-of', 'json', path],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f"ffprobe failed for {path}: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        streams = json.loads(result.stdout).get('streams', [])
+    except ValueError:
+        return None
+    return tuple(tuple(stream.get(key) for key in STREAM_COPY_KEYS) for stream in streams)
+
+def _probe_streams(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _probe_streams_cached(path, st.st_mtime, st.st_size)
+
+def can_stream_copy(paths):
+    """Check whether all files share codec, resolution, pixel format and timing,
+    so they can be concatenated with -c copy instead of re-encoding"""
+    signatures = list(PROBE_POOL.map(_probe_streams, paths))
+    if not signatures or not signatures[0]:
+        return False
+    return all(signature == signatures[0] for signature in signatures)
+
+class _LazyJoin:
+    """Formats an argv list for logging only when the record is emitted"""
+    __slots__ = ('argv',)
+    
+    def __init__(self, argv):
+        self.argv = argv
+    
+    def __str__(self):
+        return shlex.join(self.argv)
+
+def _drain_stderr(stream, tail):
+    for line in stream:
+        tail.append(line)
+    stream.close()
+
+def _run_ffmpeg_once(command, input=None, tail_kb=64):
+    """Run one ffmpeg command, keeping only the tail of its stderr
+    
+    Long encodes can log megabytes; only the last few KB matter for errors.
+    input (bytes) is written to ffmpeg's stdin, e.g. a concat list for pipe:0.
+    """
+    if '-hide_banner' not in command:
+        command = [command[0], '-hide_banner', '-loglevel', 'error', *command[1:]]
+    
+    process = subprocess.Popen(
+        command,
+        bufsize=1 << 20,
+        stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        creationflags=_CREATE_NO_WINDOW
+    )
+    # Drain stderr on its own thread so a chatty ffmpeg can never block on a
+    # full pipe while we are still writing its stdin
+    tail = collections.deque(maxlen=max(1, tail_kb * 1024 // 128))
+    drain = threading.Thread(target=_drain_stderr, args=(process.stderr, tail), daemon=True)
+    drain.start()
+    if input is not None:
+        # The write may only reach the pipe when close() flushes the buffer,
+        # so both sit inside the try
+        try:
+            with process.stdin:
+                process.stdin.write(input)
+        except BrokenPipeError:
+            pass  # FFmpeg exited without reading its input; the exit code says why
+    returncode = process.wait()
+    drain.join()
+    return subprocess.CompletedProcess(command, returncode, None, b''.join(tail).decode('utf-8', 'replace'))
+
+def run_ffmpeg(*commands, input=None):
+    """Run ffmpeg commands in order until one succeeds; returns the last result"""
+    result = None
+    for command in commands:
+        result = _run_ffmpeg_once(command, input)
+        if result.returncode == 0:
+            break
+    return result
+
+# ffprobe metadata for listed files, persisted between runs.
+# Maps path -> [mtime, size, info]; an entry is stale once mtime or size change.
+# Kept in least recently probed order and capped at PROBE_CACHE_MAX entries.
+PROBE_CACHE_MAX = 5000
+_probe_cache_path = os.path.join(OUTPUTS_DIR, '.probe_cache.json')
+_probe_cache_lock = threading.Lock()
+_probe_cache_dirty = False
+
+def _load_probe_cache():
+    try:
+        with open(_probe_cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+_probe_cache = _load_probe_cache()
+
+def _save_probe_cache():
+    """Write the probe cache back to disk, minus files that no longer exist"""
+    with _probe_cache_lock:
+        if not os.path.isdir(OUTPUTS_DIR):
+            return
+        # Deleted or renamed recordings would otherwise stay in the file forever
+        missing = [path for path in _probe_cache if not os.path.exists(path)]
+        if not _probe_cache_dirty and not missing:
+            return
+        for path in missing:
+            del _probe_cache[path]
+        data = json.dumps(_probe_cache)
+    tmp_path = _probe_cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, _probe_cache_path)
+    except OSError as e:
+        logging.warning(f"Could not save probe cache: {e}")
+
+atexit.register(_save_probe_cache)
+
+def _parse_frame_rate(rate):
+    try:
+        num, _, den = rate.partition('/')
+        return round(float(num) / float(den or 1), 3)
+    except (AttributeError, ValueError, ZeroDivisionError):
+        return None
+
+def probe_media(path, mtime, size):
+    """Return {codec, width, height, fps, duration, pix_fmt} for a media file,
+    from the probe cache when the file is unchanged"""
+    global _probe_cache_dirty
+    with _probe_cache_lock:
+        entry = _probe_cache.get(path)
+    if entry and entry[0] == mtime and entry[1] == size:
+        return entry[2]
+    
+    info = {'codec': None, 'width': None, 'height': None,
+            'fps': None, 'duration': None, 'pix_fmt': None}
+    try:
+        result = subprocess.run(
+            [FFPROBE_PATH, '-v', 'error', '-show_streams', '-show_format', '-of', 'json', path],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            creationflags=_CREATE_NO_WINDOW
+        )
+        if result.returncode != 0:
+            # Don't cache failures - the file may still be being written
+            return info
+        probe = json.loads(result.stdout)
+    except Exception as e:
+        logging.warning(f"ffprobe failed for {path}: {e}")
+        return info
+    
+    streams = probe.get('streams', [])
+    stream = next((st for st in streams if st.get('codec_type') == 'video'), None)
+    if stream is None and streams:
+        stream = streams[0]
+    if stream:
+        info['codec'] = stream.get('codec_name')
+        info['width'] = stream.get('width')
+        info['height'] = stream.get('height')
+        info['pix_fmt'] = stream.get('pix_fmt')
+        if stream.get('codec_type') == 'video':
+            info['fps'] = _parse_frame_rate(stream.get('r_frame_rate'))
+    try:
+        info['duration'] = float(probe.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        pass
+    
+    with _probe_cache_lock:
+        # Re-insert so the entry moves to the end; evict the oldest past the cap
+        _probe_cache.pop(path, None)
+        _probe_cache[path] = [mtime, size, info]
+        while len(_probe_cache) > PROBE_CACHE_MAX:
+            del _probe_cache[next(iter(_probe_cache))]
+        _probe_cache_dirty = True
+    return info
+
+# Concat demuxer reading its file list from stdin; entries must be absolute paths
+CONCAT_STDIN_INPUT = ['-f', 'concat', '-safe', '0', '-protocol_whitelist', 'file,pipe', '-i', 'pipe:0']
+
+def concat_entry(path):
+    """Concat demuxer 'file' line for an absolute path, with quotes escaped"""
+    escaped = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+# drawtext text has to survive three rounds of unescaping: the filtergraph parser,
+# the filter option parser and drawtext's own %{...} expansion
+_DRAWTEXT_EXPANSION_ESCAPES = str.maketrans({'\\': '\\\\', '%': '\\%'})
+_OPTION_ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", ':': '\\:'})
+_FILTERGRAPH_ESCAPES = str.maketrans({c: '\\' + c for c in "\\'[],;"})
+
+_DRAWTEXT_TMPL = (
+    "{inp}drawtext=text={t}:fontsize={fs}:fontcolor={fc}:"
+    "box=1:boxcolor={bg}:x={x}:y={y}:"
+    "enable='between(t,{s},{e})'{out}"
+)
+
+def escape_drawtext(text):
+    """Escape free text for drawtext=text=... inside -filter_complex"""
+    return (text.translate(_DRAWTEXT_EXPANSION_ESCAPES)
+                .translate(_OPTION_ESCAPES)
+                .translate(_FILTERGRAPH_ESCAPES))
+
+# Background FFmpeg jobs for requests sent with "async": true.
+# Consumer NVIDIA cards only allow a couple of concurrent NVENC sessions.
+JOB_WORKERS = 2 if HWACCEL['vcodec'] == 'h264_nvenc' else (os.cpu_count() or 2)
+JOB_POOL = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='ffmpeg-job')
+JOBS = {}
+JOBS_LOCK = threading.Lock()
+# Finished jobs nobody polled for (e.g. the tab was closed) are dropped after this long
+JOB_RESULT_TTL = 3600  # seconds
+
+def _mark_finished(future):
+    future.finished_at = time.monotonic()
+
+def _expire_jobs():
+    """Forget finished jobs older than JOB_RESULT_TTL; call with JOBS_LOCK held"""
+    cutoff = time.monotonic() - JOB_RESULT_TTL
+    expired = [job_id for job_id, job in JOBS.items()
+               if getattr(job['future'], 'finished_at', cutoff) < cutoff]
+    for job_id in expired:
+        del JOBS[job_id]
+
+def run_encode(*commands, input=None):
+    """Run an encode on the job pool and wait for it
+    
+    Waiting on ffmpeg already frees the request thread's GIL; going through the
+    pool keeps synchronous requests inside the same encoder/NVENC session limit
+    as background jobs.
+    """
+    return JOB_POOL.submit(run_ffmpeg, *commands, input=input).result()
+
+def submit_job(output, *commands, input=None, session=None):
+    """Queue ffmpeg commands on the job pool and return a 202 response with the job id"""
+    job_id = uuid.uuid4().hex
+    future = JOB_POOL.submit(run_ffmpeg, *commands, input=input)
+    future.add_done_callback(_mark_finished)
+    if session is not None:
+        # The job writes into the session folder - drop its cached listing when done
+        future.add_done_callback(lambda _: invalidate_session(session))
+    with JOBS_LOCK:
+        _expire_jobs()
+        JOBS[job_id] = {'future': future, 'output': output}
+    return jsonify({'success': True, 'job_id': job_id, 'output': output}), 202
+
+class RequestError(ValueError):
+    """Malformed JSON request body - reported to the client as a 400"""
+
+# Runtime checks for dataclass field annotations; other annotations aren't checked
+_FIELD_TYPES = {str: str, float: (int, float), int: int, bool: bool, list: list, dict: dict}
+
+def parse_request(cls):
+    """Validate the JSON body against a request dataclass
+    
+    Returns (instance, raw payload). Unknown keys are ignored.
+    """
+    payload = request.get_json(silent=True, cache=False)
+    if not isinstance(payload, dict):
+        raise RequestError('Expected a JSON object')
+    
+    values = {}
+    for field in dataclasses.fields(cls):
+        if field.name not in payload:
+            if field.default is dataclasses.MISSING:
+                raise RequestError(f"Missing field '{field.name}'")
+            continue
+        value = payload[field.name]
+        expected = _FIELD_TYPES.get(field.type)
+        if expected is not None and not (value is None and field.default is None):
+            if not isinstance(value, expected) or (isinstance(value, bool) and field.type is not bool):
+                raise RequestError(f"Field '{field.name}' must be of type {field.type.__name__}")
+        values[field.name] = value
+    return cls(**values), payload
+
+@dataclass
+class TrimReq:
+    session: str
+    filename: str
+    start_time: float
+    end_time: float
+
+@dataclass
+class MergeReq:
+    session: str
+    files: list
+    output_name: str = 'merged_output.mp4'
+    layout: str = 'grid'  # grid, horizontal, vertical
+
+@dataclass
+class AddAudioReq:
+    session: str
+    video_file: str
+    audio_file: str
+    output_name: str = 'video_with_audio.mp4'
+
+@dataclass
+class ExportReq:
+    session: str
+    input_file: str
+    format: str = 'mp4'
+    quality: str = 'high'
+
+@dataclass
+class FinalizeReq:
+    session: str
+    video_file: str
+    audio_file: str
+    format: str = 'mp4'
+    quality: str = 'high'
+
+@dataclass
+class TimelineReq:
+    session: str
+    timeline: dict
+    output_name: Optional[str] = None
+
+@dataclass
+class OverlayReq:
+    session: str
+    background_video: str
+    overlay_video: str
+    output_name: str = 'overlay_output.mp4'
+    position_x: Any = '20'
+    position_y: Any = '20'
+    overlay_width: Any = None
+    overlay_height: Any = None
+    overlay_scale: float = 0.25
+
+@dataclass
+class RecordAudioReq:
+    session: str
+    duration: float = 10
+    device_name: Optional[str] = None
+    output_name: Optional[str] = None
+
+# Fixed merge layouts, keyed by number of inputs
+_GRID_FILTERS = {
+    2: "[0:v][1:v]hstack=inputs=2[v]",
+    3: "[0:v][1:v][2:v]hstack=inputs=3[v]",
+    4: "[0:v][1:v]hstack=inputs=2[top];[2:v][3:v]hstack=inputs=2[bottom];[top][bottom]vstack=inputs=2[v]"
+}
+_STACK_MAP_ARGS = ("-map", "[v]")
+
+# "[0:v][1:v]..." input label prefixes for hstack/vstack, precomputed up to 16 inputs
+_STACK_PREFIX = tuple(''.join(f'[{i}:v]' for i in range(n)) for n in range(17))
+
+def _stack_prefix(count):
+    if count < len(_STACK_PREFIX):
+        return _STACK_PREFIX[count]
+    return ''.join(f'[{i}:v]' for i in range(count))
+
+# Scratch files written into session folders by older versions of the editor
+_LEGACY_TEMP_PATTERNS = ('temp_trim_*.mp4', 'timeline_concat.txt', 'concat_list.txt')
+
+def cleanup_orphaned_temp_files():
+    """Remove scratch files that older exports left behind in session folders"""
+    outputs = Path(OUTPUTS_DIR)
+    if not outputs.is_dir():
+        return
+    for session_dir in outputs.iterdir():
+        if not session_dir.is_dir():
+            continue
+        for pattern in _LEGACY_TEMP_PATTERNS:
+            for temp_file in session_dir.glob(pattern):
+                try:
+                    temp_file.unlink()
+                except OSError as e:
+                    logging.warning(f"Could not remove {temp_file}: {e}")
+
+# /api/sessions listing cache. Each session is checked against the size and
+# mtime of its media files, which also change while a recording is being
+# written (the folder mtime doesn't); probe results are cached per file.
+# Scans run without the lock; 'generation' tells them an invalidation happened meanwhile.
+_SESSIONS_CACHE = {'mtime': None, 'payload': None, 'body': None, 'generation': 0}
+_SESSION_FILES_CACHE = {}  # session name -> (file signature, files list)
+_SESSIONS_LOCK = threading.Lock()
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def invalidate_session(session):
+    """Forget the cached listing for a session after writing into it"""
+    with _SESSIONS_LOCK:
+        _SESSION_FILES_CACHE.pop(session, None)
+        _SESSIONS_CACHE['payload'] = None
+        _SESSIONS_CACHE['generation'] += 1
+
+def _session_signature(session_path):
+    """(name, size, mtime_ns) of every media file in a session folder"""
+    signature = set()
+    with os.scandir(session_path) as file_entries:
+        for file_entry in file_entries:
+            if file_entry.name.endswith(VIDEO_AUDIO_EXTS) and file_entry.is_file():
+                st = file_entry.stat()
+                signature.add((file_entry.name, st.st_size, st.st_mtime_ns))
+    return frozenset(signature)
+
+def _isoformat_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+def _scan_session_files(session_path):
+    """Build the file list for one session folder"""
+    # Hot loop: bind lookups to locals once. orjson writes naive datetimes
+    # as ISO 8601 itself, so skip isoformat() when it is in use.
+    fmt_time = datetime.fromtimestamp if orjson is not None else _isoformat_timestamp
+    files = []
+    probe_args = []
+    add_file = files.append
+    add_probe = probe_args.append
+    with os.scandir(session_path) as file_entries:
+        for file_entry in file_entries:
+            file = file_entry.name
+            if file.endswith(VIDEO_AUDIO_EXTS) and file_entry.is_file():
+                st = file_entry.stat()
+                size = st.st_size
+                mtime = st.st_mtime
+                add_file({
+                    'name': file,
+                    'type': 'video' if file.endswith(VIDEO_EXTS) else 'audio',
+                    'size': size,
+                    'modified': fmt_time(mtime)
+                })
+                add_probe((file_entry.path, mtime, size))
+    
+    # Cache misses are probed concurrently
+    for file_info, media_info in zip(files, PROBE_POOL.map(probe_media, *zip(*probe_args))):
+        file_info.update(media_info)
+    return files
+
+def default_audio_device():
+    """Name of the first dshow audio device, cached for DEFAULT_AUDIO_DEVICE_TTL seconds"""
+    global _DEFAULT_AUDIO_DEVICE, _DEFAULT_AUDIO_DEVICE_TS
+    if _DEFAULT_AUDIO_DEVICE and time.time() - _DEFAULT_AUDIO_DEVICE_TS < DEFAULT_AUDIO_DEVICE_TTL:
+        return _DEFAULT_AUDIO_DEVICE
+    
+    result = subprocess.run(
+        [FFMPEG_PATH, '-f', 'dshow', '-list_devices', 'true', '-i', 'dummy'],
+        capture_output=True,
+        creationflags=_CREATE_NO_WINDOW
+    )
+    
+    # Parse device name from error output (ffmpeg writes UTF-8)
+    match = _DSHOW_AUDIO_RE.search(result.stderr)
+    device_name = match.group(1).decode('utf-8', 'replace') if match else None
+    
+    _DEFAULT_AUDIO_DEVICE = device_name
+    _DEFAULT_AUDIO_DEVICE_TS = time.time()
+    return device_name
+
+def forget_default_audio_device():
+    global _DEFAULT_AUDIO_DEVICE
+    _DEFAULT_AUDIO_DEVICE = None
+
+# Real path of the outputs folder; every session path must resolve inside it
+_OUTPUTS_REAL = os.path.realpath(OUTPUTS_DIR)
+
+@functools.lru_cache(maxsize=256)
+def _session_dir(name):
+    """Resolve a session name to its folder once, rejecting paths outside OUTPUTS_DIR"""
+    path = os.path.realpath(os.path.join(OUTPUTS_DIR, name))
+    if path == _OUTPUTS_REAL or os.path.commonpath([path, _OUTPUTS_REAL]) != _OUTPUTS_REAL:
+        raise RequestError(f"Invalid session '{name}'")
+    return path
+
+def _session_file(session_path, filename):
+    """Join a client-supplied filename onto a session folder, rejecting traversal"""
+    path = os.path.normpath(os.path.join(session_path, filename))
+    if path == session_path or os.path.commonpath([path, session_path]) != session_path:
+        raise RequestError(f"Invalid file name '{filename}'")
+    return path
+
 @app.route('/')
 def index():
     """Main editor interface - redirect to timeline editor"""
@@ -67,32 +827,69 @@ def index():
 def list_sessions():
     """List all recording sessions"""
     try:
+        if not os.path.exists(OUTPUTS_DIR):
+            return jsonify({'sessions': []})
+        
+        # Scanning and probing can take a while; only read and swap the cache
+        # under the lock so invalidate_session() never waits on a listing
+        with _SESSIONS_LOCK:
+            cache = dict(_SESSION_FILES_CACHE)
+            cached_mtime = _SESSIONS_CACHE['mtime']
+            cached_body = _SESSIONS_CACHE['body'] if _SESSIONS_CACHE['payload'] is not None else None
+            generation = _SESSIONS_CACHE['generation']
+        
+        root_mtime = _mtime_ns(OUTPUTS_DIR)
+        entries = []
+        stale = []
+        with os.scandir(OUTPUTS_DIR) as session_entries:
+            for session_entry in session_entries:
+                if not session_entry.is_dir(follow_symlinks=False):
+                    continue
+                # Only rescan sessions whose files changed
+                signature = _session_signature(session_entry.path)
+                cached = cache.get(session_entry.name)
+                if cached is not None and cached[0] == signature:
+                    files = cached[1]
+                else:
+                    files = None
+                    stale.append(session_entry.path)
+                entries.append((session_entry.name, session_entry.path, signature, files))
+        
+        # Nothing added, removed or changed since the last scan - serve the bytes encoded then
+        if (not stale and cached_body is not None and cached_mtime == root_mtime
+                and len(entries) == len(cache)):
+            return _json_body_response(cached_body)
+        
+        rescanned = dict(zip(stale, SCAN_POOL.map(_scan_session_files, stale)))
+        
         sessions = []
-        if os.path.exists(OUTPUTS_DIR):
-            for session_name in os.listdir(OUTPUTS_DIR):
-                session_path = os.path.join(OUTPUTS_DIR, session_name)
-                if os.path.isdir(session_path):
-                    # Get all video and audio files
-                    files = []
-                    for file in os.listdir(session_path):
-                        if file.endswith(('.mp4', '.wav', '.mp3')):
-                            file_path = os.path.join(session_path, file)
-                            file_info = {
-                                'name': file,
-                                'type': 'video' if file.endswith('.mp4') else 'audio',
-                                'size': os.path.getsize(file_path),
-                                'modified': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                            }
-                            files.append(file_info)
-                    
-                    sessions.append({
-                        'name': session_name,
-                        'path': session_path,
-                        'files': files,
-                        'file_count': len(files)
-                    })
+        scanned = {}
+        for name, session_path, signature, files in entries:
+            if files is None:
+                files = rescanned[session_path]
+            if any(file_info['duration'] is None for file_info in files):
+                # A file couldn't be probed (perhaps still being written) - probe it again next time
+                signature = None
+            scanned[name] = (signature, files)
+            sessions.append({
+                'name': name,
+                'path': session_path,
+                'files': files,
+                'file_count': len(files)
+            })
         
-        return jsonify({'sessions': sessions})
+        payload = {'sessions': sessions}
+        body = _json_bytes(payload)
+        with _SESSIONS_LOCK:
+            # Don't store a scan that raced with an invalidation; the next listing redoes it
+            if _SESSIONS_CACHE['generation'] == generation:
+                _SESSION_FILES_CACHE.clear()
+                _SESSION_FILES_CACHE.update(scanned)
+                _SESSIONS_CACHE['mtime'] = root_mtime
+                _SESSIONS_CACHE['payload'] = payload
+                _SESSIONS_CACHE['body'] = body
+        
+        return _json_body_response(body)
     except Exception as e:
         logging.error(f"Error listing sessions: {e}")
         return jsonify({'error': str(e)}), 500
@@ -101,8 +898,21 @@ def list_sessions():
 def preview_file(session_name, filename):
     """Preview a video or audio file"""
     try:
-        session_path = os.path.join(OUTPUTS_DIR, session_name)
-        return send_from_directory(session_path, filename)
+        session_path = _session_dir(session_name)
+        if X_ACCEL_PREFIX:
+            # Let nginx serve the file itself
+            if not os.path.isfile(safe_join(session_path, filename) or ''):
+                return jsonify({'error': 'File not found'}), 404
+            response = make_response('')
+            response.headers['X-Accel-Redirect'] = f"{X_ACCEL_PREFIX}/{quote(session_name)}/{quote(filename)}"
+            return response
+        # Servers without a native (sendfile) file wrapper get large reads instead
+        # of Werkzeug's 8 KB default
+        request.environ.setdefault('wsgi.file_wrapper', _preview_file_wrapper)
+        # Conditional + range requests, so the player can revalidate and seek cheaply.
+        # max_age=0: outputs like merged_output.mp4 are overwritten in place, so the
+        # browser must revalidate every time - an unchanged file is just a 304.
+        return send_from_directory(session_path, filename, conditional=True, etag=True, max_age=0)
     except Exception as e:
         logging.error(f"Error previewing file: {e}")
         return jsonify({'error': str(e)}), 404
@@ -124,12 +934,13 @@ def upload_video():
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
         # Create session directory if it doesn't exist
-        session_path = os.path.join(OUTPUTS_DIR, session)
+        session_path = _session_dir(session)
         os.makedirs(session_path, exist_ok=True)
         
         # Save the file
-        file_path = os.path.join(session_path, file.filename)
+        file_path = _session_file(session_path, file.filename)
         file.save(file_path)
+        invalidate_session(session)
         
         logging.info(f"Uploaded file: {file.filename} to session: {session}")
         
@@ -139,6 +950,8 @@ def upload_video():
             'message': f'File uploaded successfully to {session}'
         })
         
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error uploading file: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -147,15 +960,15 @@ def upload_video():
 def trim_video():
     """Trim a video file"""
     try:
-        data = request.json
-        session = data['session']
-        filename = data['filename']
-        start_time = data['start_time']
-        end_time = data['end_time']
+        req, data = parse_request(TrimReq)
+        session = req.session
+        filename = req.filename
+        start_time = req.start_time
+        end_time = req.end_time
         
-        input_path = os.path.join(OUTPUTS_DIR, session, filename)
+        input_path = _session_file(_session_dir(session), filename)
         output_filename = f"trimmed_{filename}"
-        output_path = os.path.join(OUTPUTS_DIR, session, output_filename)
+        output_path = _session_file(_session_dir(session), output_filename)
         
         duration = end_time - start_time
         
@@ -168,14 +981,13 @@ def trim_video():
             output_path
         ]
         
-        logging.info(f"Trimming video: {' '.join(command)}")
+        logging.info("Trimming video: %s", _LazyJoin(command))
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        if data.get('async'):
+            return submit_job(output_filename, command, session=session)
+        
+        result = run_ffmpeg(command)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -189,6 +1001,8 @@ def trim_video():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error trimming video: {e}")
         return jsonify({'error': str(e)}), 500
@@ -197,71 +1011,60 @@ def trim_video():
 def merge_videos():
     """Merge multiple video/audio files"""
     try:
-        data = request.json
-        session = data['session']
-        files = data['files']  # List of filenames to merge
-        output_name = data.get('output_name', 'merged_output.mp4')
-        layout = data.get('layout', 'grid')  # grid, horizontal, vertical
+        req, data = parse_request(MergeReq)
+        session = req.session
+        files = req.files  # List of filenames to merge
+        output_name = req.output_name
+        layout = req.layout
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        output_path = os.path.join(session_path, output_name)
+        session_path = _session_dir(session)
+        output_path = _session_file(session_path, output_name)
         
         # Create filter complex for layout
         if layout == 'grid' and len(files) > 1:
-            # Grid layout (2x2, 3x3, etc.)
-            if len(files) == 2:
-                filter_complex = "[0:v][1:v]hstack=inputs=2[v]"
-                map_args = ["-map", "[v]"]
-            elif len(files) == 3:
-                filter_complex = "[0:v][1:v][2:v]hstack=inputs=3[v]"
-                map_args = ["-map", "[v]"]
-            elif len(files) == 4:
-                filter_complex = "[0:v][1:v]hstack=inputs=2[top];[2:v][3:v]hstack=inputs=2[bottom];[top][bottom]vstack=inputs=2[v]"
-                map_args = ["-map", "[v]"]
-            else:
-                # For more than 4, use simple concatenation
-                filter_complex = None
-                map_args = []
-        elif layout == 'horizontal':
-            filter_complex = f"{''.join([f'[{i}:v]' for i in range(len(files))])}hstack=inputs={len(files)}[v]"
-            map_args = ["-map", "[v]"]
-        elif layout == 'vertical':
-            filter_complex = f"{''.join([f'[{i}:v]' for i in range(len(files))])}vstack=inputs={len(files)}[v]"
-            map_args = ["-map", "[v]"]
+            # Grid layout (2x2, 3x3, etc.); more than 4 falls back to simple concatenation
+            filter_complex = _GRID_FILTERS.get(len(files))
+        elif layout in ('horizontal', 'vertical'):
+            stack = 'hstack' if layout == 'horizontal' else 'vstack'
+            filter_complex = f"{_stack_prefix(len(files))}{stack}=inputs={len(files)}[v]"
         else:
             # Concatenate
             filter_complex = None
-            map_args = []
-        
-        # Build ffmpeg command
-        command = [FFMPEG_PATH, '-y']
+        map_args = _STACK_MAP_ARGS if filter_complex else []
         
-        # Add input files
-        for file in files:
-            command.extend(['-i', os.path.join(session_path, file)])
+        file_paths = [_session_file(session_path, file) for file in files]
         
-        # Add filter if applicable
+        # Build ffmpeg command
+        concat_input = None
         if filter_complex:
+            command = [FFMPEG_PATH, '-y', *FILTER_THREAD_ARGS]
+            
+            # Add input files
+            for file_path in file_paths:
+                command.extend([*HWACCEL['decode'], '-i', file_path])
+            
             command.extend(['-filter_complex', filter_complex])
             command.extend(map_args)
+            command.extend(['-c:v', HWACCEL['vcodec'], *HWACCEL['vopts'], *ENCODER_THREAD_ARGS, output_path])
         else:
-            # Simple concatenation
-            concat_file = os.path.join(session_path, 'concat_list.txt')
-            with open(concat_file, 'w') as f:
-                for file in files:
-                    f.write(f"file '{file}'\n")
-            command = [FFMPEG_PATH, '-y', '-f', 'concat', '-safe', '0', '-i', concat_file]
+            # Simple concatenation - the list is fed to ffmpeg on stdin
+            concat_input = ''.join(concat_entry(path) for path in file_paths).encode('utf-8')
+            
+            if can_stream_copy(file_paths):
+                # Identical recordings - just remux, no decode/encode
+                command = [FFMPEG_PATH, '-y', *CONCAT_STDIN_INPUT,
+                           '-c', 'copy', '-movflags', '+faststart', output_path]
+            else:
+                command = [FFMPEG_PATH, '-y', *HWACCEL['decode'], *CONCAT_STDIN_INPUT,
+                           '-c:v', HWACCEL['vcodec'], *HWACCEL['vopts'], *ENCODER_THREAD_ARGS, output_path]
         
-        command.extend(['-c:v', 'libx264', '-preset', 'fast', output_path])
+        logging.info("Merging videos: %s", _LazyJoin(command))
         
-        logging.info(f"Merging videos: {' '.join(command)}")
+        if data.get('async'):
+            return submit_job(output_name, command, input=concat_input, session=session)
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        result = run_encode(command, input=concat_input)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -275,6 +1078,8 @@ def merge_videos():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error merging videos: {e}")
         return jsonify({'error': str(e)}), 500
@@ -283,16 +1088,16 @@ def merge_videos():
 def add_audio_to_video():
     """Add audio track to video"""
     try:
-        data = request.json
-        session = data['session']
-        video_file = data['video_file']
-        audio_file = data['audio_file']
-        output_name = data.get('output_name', 'video_with_audio.mp4')
+        req, data = parse_request(AddAudioReq)
+        session = req.session
+        video_file = req.video_file
+        audio_file = req.audio_file
+        output_name = req.output_name
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        video_path = os.path.join(session_path, video_file)
-        audio_path = os.path.join(session_path, audio_file)
-        output_path = os.path.join(session_path, output_name)
+        session_path = _session_dir(session)
+        video_path = _session_file(session_path, video_file)
+        audio_path = _session_file(session_path, audio_file)
+        output_path = _session_file(session_path, output_name)
         
         command = [
             FFMPEG_PATH, '-y',
@@ -300,19 +1105,17 @@ def add_audio_to_video():
             '-i', audio_path,
             '-c:v', 'copy',
             '-c:a', 'aac',
-            '-map', '0:v:0',
-            '-map', '1:a:0',
+            *MAP_VIDEO_AUDIO_ARGS,
             output_path
         ]
         
-        logging.info(f"Adding audio to video: {' '.join(command)}")
+        logging.info("Adding audio to video: %s", _LazyJoin(command))
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        if data.get('async'):
+            return submit_job(output_name, command, session=session)
+        
+        result = run_ffmpeg(command)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -326,6 +1129,8 @@ def add_audio_to_video():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error adding audio: {e}")
         return jsonify({'error': str(e)}), 500
@@ -334,44 +1139,64 @@ def add_audio_to_video():
 def export_final():
     """Export final edited video"""
     try:
-        data = request.json
-        session = data['session']
-        input_file = data['input_file']
-        export_format = data.get('format', 'mp4')
-        quality = data.get('quality', 'high')
+        req, data = parse_request(ExportReq)
+        session = req.session
+        input_file = req.input_file
+        export_format = req.format
+        quality = req.quality
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        input_path = os.path.join(session_path, input_file)
+        session_path = _session_dir(session)
+        input_path = _session_file(session_path, input_file)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"export_{timestamp}.{export_format}"
-        output_path = os.path.join(session_path, output_filename)
-        
-        # Quality presets
-        quality_settings = {
-            'high': ['-crf', '18', '-preset', 'slow'],
-            'medium': ['-crf', '23', '-preset', 'medium'],
-            'low': ['-crf', '28', '-preset', 'fast']
-        }
+        output_path = _session_file(session_path, output_filename)
         
         command = [
             FFMPEG_PATH, '-y',
+            *HWACCEL['decode'],
             '-i', input_path,
-            '-c:v', 'libx264',
-            *quality_settings.get(quality, quality_settings['medium']),
-            '-c:a', 'aac',
-            '-b:a', '192k',
+            *VIDEO_QUALITY_ARGS.get(quality, VIDEO_QUALITY_ARGS['medium']),
+            *AAC_AUDIO_ARGS,
             output_path
         ]
         
-        logging.info(f"Exporting video: {' '.join(command)}")
+        # An H.264 recording exported to MP4 at high quality needs no re-encode
+        if quality == 'high' and export_format == 'mp4' and probe_codec(input_path) == 'h264':
+            copy_command = [
+                FFMPEG_PATH, '-y',
+                '-i', input_path,
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                output_path
+            ]
+            
+            logging.info("Exporting video (stream copy): %s", _LazyJoin(copy_command))
+            
+            if data.get('async'):
+                # Re-encode only if the copy fails
+                return submit_job(output_filename, copy_command, command, session=session)
+            
+            result = run_ffmpeg(copy_command)
+            invalidate_session(session)
+            
+            if result.returncode == 0:
+                return jsonify({
+                    'success': True,
+                    'output': output_filename,
+                    'message': 'Video exported successfully'
+                })
+            
+            # e.g. an audio codec MP4 can't hold - fall back to re-encoding
+            logging.warning(f"Stream copy export failed, re-encoding: {result.stderr}")
+        
+        logging.info("Exporting video: %s", _LazyJoin(command))
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        if data.get('async'):
+            return submit_job(output_filename, command, session=session)
+        
+        result = run_encode(command)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -385,11 +1210,88 @@ def export_final():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error exporting video: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/finalize', methods=['POST'])
+def finalize_video():
+    """Add an audio track and export in one pass (add-audio + export without a second encode)"""
+    try:
+        req, data = parse_request(FinalizeReq)
+        session = req.session
+        quality = req.quality
+        
+        session_path = _session_dir(session)
+        video_path = _session_file(session_path, req.video_file)
+        audio_path = _session_file(session_path, req.audio_file)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"export_{timestamp}.{req.format}"
+        output_path = _session_file(session_path, output_filename)
+        
+        command = [
+            FFMPEG_PATH, '-y',
+            *HWACCEL['decode'],
+            '-i', video_path,
+            '-i', audio_path,
+            *MAP_VIDEO_AUDIO_ARGS,
+            *VIDEO_QUALITY_ARGS.get(quality, VIDEO_QUALITY_ARGS['medium']),
+            *AAC_AUDIO_ARGS,
+            output_path
+        ]
+        
+        logging.info("Finalizing video: %s", _LazyJoin(command))
+        
+        if data.get('async'):
+            return submit_job(output_filename, command, session=session)
+        
+        result = run_encode(command)
+        invalidate_session(session)
+        
+        if result.returncode == 0:
+            return jsonify({
+                'success': True,
+                'output': output_filename,
+                'message': 'Video exported successfully'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': result.stderr
+            }), 500
+            
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"Error finalizing video: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/job/<job_id>')
+def job_status(job_id):
+    """Poll a background job started with "async": true"""
+    with JOBS_LOCK:
+        job = JOBS.get(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Unknown job'}), 404
+        if not job['future'].done():
+            return jsonify({'success': True, 'status': 'running', 'job_id': job_id})
+        # Finished jobs are reported once and then forgotten
+        del JOBS[job_id]
+    
+    try:
+        result = job['future'].result()
+    except Exception as e:
+        return jsonify({'success': False, 'status': 'failed', 'error': str(e)}), 500
+    
+    if result.returncode == 0:
+        return jsonify({'success': True, 'status': 'done', 'output': job['output']})
+    return jsonify({'success': False, 'status': 'failed', 'error': result.stderr}), 500
+
 @app.route('/timeline')
 def timeline_editor():
     """Timeline-based editor (Clipchamp style)"""
@@ -399,19 +1301,19 @@ def timeline_editor():
 def export_timeline():
     """Export project from timeline with text overlays and transitions"""
     try:
-        data = request.json
-        session = data['session']
-        timeline = data['timeline']
-        output_name = data.get('output_name', f"timeline_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4")
+        req, data = parse_request(TimelineReq)
+        session = req.session
+        timeline = req.timeline
+        output_name = req.output_name or f"timeline_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        output_path = os.path.join(session_path, output_name)
+        session_path = _session_dir(session)
+        output_path = _session_file(session_path, output_name)
         
         # Collect all video clips from tracks
         all_clips = []
         for track_name, clips in timeline['tracks'].items():
             for clip in clips:
-                clip_path = os.path.join(session_path, clip['file'])
+                clip_path = _session_file(session_path, clip['file'])
                 if os.path.exists(clip_path) and clip_path.endswith('.mp4'):
                     all_clips.append({
                         'path': clip_path,
@@ -429,40 +1331,23 @@ def export_timeline():
         background_music = next((item for item in timeline.get('items', []) if item.get('type') == 'background_music'), None)
         watermark = timeline.get('watermark')  # Get watermark configuration
         
-        # Process videos with trimming if needed
-        processed_clips = []
-        temp_files = []
+        # Trims are applied inside the final ffmpeg run: input-side -ss/-t on the
+        # filter graph path (ffmpeg seeks instead of decoding the skipped part),
+        # inpoint/outpoint on the concat path
+        processed_clips = [clip['path'] for clip in all_clips]
         
-        for i, clip in enumerate(all_clips):
-            if clip['trim_start'] > 0 or clip['trim_end']:
-                # Need to trim this clip first
-                temp_output = os.path.join(session_path, f'temp_trim_{i}.mp4')
-                trim_cmd = [FFMPEG_PATH, '-y', '-i', clip['path']]
-                
-                if clip['trim_start'] > 0:
-                    trim_cmd.extend(['-ss', str(clip['trim_start'])])
-                
-                if clip['trim_end']:
-                    duration = clip['trim_end'] - clip['trim_start']
-                    trim_cmd.extend(['-t', str(duration)])
-                
-                trim_cmd.extend(['-c', 'copy', temp_output])
-                
-                result = subprocess.run(
-                    trim_cmd,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                )
-                
-                if result.returncode == 0:
-                    processed_clips.append(temp_output)
-                    temp_files.append(temp_output)
-                else:
-                    # If trim fails, use original
-                    processed_clips.append(clip['path'])
-            else:
-                processed_clips.append(clip['path'])
+        def is_trimmed(i):
+            return all_clips[i]['trim_start'] > 0 or bool(all_clips[i]['trim_end'])
+        
+        def trim_input_args(i):
+            """Seek options to place before clip i's -i"""
+            clip = all_clips[i]
+            args = []
+            if clip['trim_start'] > 0:
+                args.extend(['-ss', str(clip['trim_start'])])
+            if clip['trim_end']:
+                args.extend(['-t', str(clip['trim_end'] - clip['trim_start'])])
+            return args
         
         # Build filter complex for text overlays and transitions
         filter_parts = []
@@ -497,7 +1382,7 @@ def export_timeline():
         if text_overlays:
             base_input = '[vout]' if transitions else '[0:v]'
             for text_idx, text_item in enumerate(text_overlays):
-                text = text_item.get('text', '').replace("'", "\\'")
+                text = escape_drawtext(text_item.get('text', ''))
                 font_size = text_item.get('fontSize', 48)
                 font_color = text_item.get('fontColor', 'white')
                 bg_color = text_item.get('backgroundColor', 'black@0.5')
@@ -512,17 +1397,16 @@ def export_timeline():
                 
                 output_label = f'[tout{text_idx}]' if text_idx < len(text_overlays) - 1 else '[final]'
                 
-                filter_parts.append(
-                    f"{base_input}drawtext=text='{text}':fontsize={font_size}:fontcolor={font_color}:"
-                    f"box=1:boxcolor={bg_color}:x={x_expr}:y={y_expr}:"
-                    f"enable='between(t,{start_time},{start_time + duration})'{output_label}"
-                )
+                filter_parts.append(_DRAWTEXT_TMPL.format(
+                    inp=base_input, t=text, fs=font_size, fc=font_color, bg=bg_color,
+                    x=x_expr, y=y_expr, s=start_time, e=start_time + duration, out=output_label
+                ))
                 base_input = output_label
         
         # Add watermark overlay
         watermark_input_index = None
         if watermark and watermark.get('filename'):
-            watermark_path = os.path.join(session_path, watermark['filename'])
+            watermark_path = _session_file(session_path, watermark['filename'])
             if os.path.exists(watermark_path):
                 # We'll add watermark as an input later
                 watermark_input_index = len(processed_clips)
@@ -547,41 +1431,44 @@ def export_timeline():
                 base_input = '[final]' if text_overlays else ('[vout]' if transitions else '[0:v]')
                 filter_parts.append(f'{base_input}[{watermark_input_index}:v]overlay={overlay_pos}:format=auto:alpha={opacity}[watermarked]')
         
-        # Create concat file or use filter complex
+        # Concat list on stdin or filter complex
+        concat_input = None
         if not filter_parts and not background_music and not watermark:
             # Simple concatenation without effects
-            concat_file = os.path.join(session_path, 'timeline_concat.txt')
-            with open(concat_file, 'w') as f:
-                for clip_path in processed_clips:
-                    f.write(f"file '{os.path.basename(clip_path)}'\n")
+            concat_lines = []
+            for clip in all_clips:
+                concat_lines.append(concat_entry(clip['path']))
+                if clip['trim_start'] > 0:
+                    concat_lines.append(f"inpoint {clip['trim_start']}\n")
+                if clip['trim_end']:
+                    concat_lines.append(f"outpoint {clip['trim_end']}\n")
+            concat_input = ''.join(concat_lines).encode('utf-8')
             
             command = [
                 FFMPEG_PATH, '-y',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', concat_file,
+                *CONCAT_STDIN_INPUT,
                 '-c', 'copy',
                 output_path
             ]
         else:
             # Complex filtering with transitions/text/music/watermark
-            command = [FFMPEG_PATH, '-y']
+            command = [FFMPEG_PATH, '-y', *FILTER_THREAD_ARGS]
             
             # Add all input files
-            for clip_path in processed_clips:
-                command.extend(['-i', clip_path])
+            for i, clip_path in enumerate(processed_clips):
+                command.extend([*HWACCEL['decode'], *trim_input_args(i), '-i', clip_path])
             
             # Add background music as input if specified
             music_input_index = None
             if background_music:
-                music_path = os.path.join(session_path, background_music['file'])
+                music_path = _session_file(session_path, background_music['file'])
                 if os.path.exists(music_path):
                     command.extend(['-i', music_path])
                     music_input_index = len(processed_clips)
             
             # Add watermark image as input if specified
             if watermark_input_index is not None and watermark:
-                watermark_path = os.path.join(session_path, watermark['filename'])
+                watermark_path = _session_file(session_path, watermark['filename'])
                 if os.path.exists(watermark_path):
                     command.extend(['-i', watermark_path])
             
@@ -610,18 +1497,21 @@ def export_timeline():
                         f'[0:a][{music_input_index}:a]amix=inputs=2:weights=1 {volume}[aout]'
                     )
             
-            # Join all filters
-            if filter_list:
-                filter_complex = ';'.join(filter_list)
-                command.extend(['-filter_complex', filter_complex])
-            
             # Map the outputs
             if watermark_input_index is not None:
                 final_video_label = '[watermarked]'
+            elif text_overlays:
+                final_video_label = '[final]'
+            elif transitions:
+                final_video_label = '[vout]'
             else:
-                final_video_label = '[final]' if text_overlays else ('[vout]' if transitions else '[0:v]')
+                final_video_label = '0:v'
             command.extend(['-map', final_video_label])
             
+            # Only the audio is filtered (music mix) - the video can be copied as-is,
+            # unless it is trimmed: a copy can only start on a keyframe
+            copy_video = final_video_label == '0:v' and not is_trimmed(0)
+            
             # Map audio output
             if music_input_index is not None:
                 command.extend(['-map', '[aout]'])
@@ -629,40 +1519,29 @@ def export_timeline():
                 # Use original audio
                 command.extend(['-map', '0:a?'])
             
+            # Join all filters
+            if filter_list:
+                filter_complex = ';'.join(filter_list)
+                command.extend(['-filter_complex', filter_complex])
+            
             # Encoding settings
+            if copy_video:
+                command.extend(['-c:v', 'copy'])
+            else:
+                command.extend(['-c:v', HWACCEL['vcodec'], *HWACCEL['vopts'], *ENCODER_THREAD_ARGS])
             command.extend([
-                '-c:v', 'libx264',
-                '-preset', 'fast',
-                '-crf', '23',
-                '-c:a', 'aac',
-                '-b:a', '192k',
+                *AAC_AUDIO_ARGS,
                 '-shortest',  # Stop when shortest stream ends
                 output_path
             ])
         
-        logging.info(f"Exporting timeline: {' '.join(command)}")
+        logging.info("Exporting timeline: %s", _LazyJoin(command))
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        if data.get('async'):
+            return submit_job(output_name, command, input=concat_input, session=session)
         
-        # Clean up temp files
-        for temp_file in temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except:
-                pass
-        
-        concat_file = os.path.join(session_path, 'timeline_concat.txt')
-        if os.path.exists(concat_file):
-            try:
-                os.remove(concat_file)
-            except:
-                pass
+        result = run_encode(command, input=concat_input)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -677,6 +1556,8 @@ def export_timeline():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error exporting timeline: {e}")
         return jsonify({'error': str(e)}), 500
@@ -686,53 +1567,71 @@ def export_timeline():
 def overlay_videos():
     """Overlay one video on top of another (picture-in-picture)"""
     try:
-        data = request.json
-        session = data['session']
-        background_video = data['background_video']  # Desktop recording
-        overlay_video = data['overlay_video']  # Camera recording
-        output_name = data.get('output_name', 'overlay_output.mp4')
+        req, data = parse_request(OverlayReq)
+        session = req.session
+        background_video = req.background_video  # Desktop recording
+        overlay_video = req.overlay_video  # Camera recording
+        output_name = req.output_name
         
         # Position and size of overlay
-        position_x = data.get('position_x', '20')
-        position_y = data.get('position_y', '20')
+        position_x = req.position_x
+        position_y = req.position_y
         
         # Use exact pixel dimensions if provided, otherwise use scale
-        overlay_width = data.get('overlay_width')
-        overlay_height = data.get('overlay_height')
-        overlay_scale = data.get('overlay_scale', 0.25)
+        overlay_width = req.overlay_width
+        overlay_height = req.overlay_height
+        overlay_scale = req.overlay_scale
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        background_path = os.path.join(session_path, background_video)
-        overlay_path = os.path.join(session_path, overlay_video)
-        output_path = os.path.join(session_path, output_name)
+        session_path = _session_dir(session)
+        background_path = _session_file(session_path, background_video)
+        overlay_path = _session_file(session_path, overlay_video)
+        output_path = _session_file(session_path, output_name)
         
         # Build filter complex for picture-in-picture
         if overlay_width and overlay_height:
             # Scale overlay to exact pixel dimensions
-            filter_complex = f"[1:v]scale={overlay_width}:{overlay_height}[ovrl];[0:v][ovrl]overlay={position_x}:{position_y}"
+            size = f"{overlay_width}:{overlay_height}"
         else:
             # Scale overlay by percentage of its original size
-            filter_complex = f"[1:v]scale=iw*{overlay_scale}:ih*{overlay_scale}[ovrl];[0:v][ovrl]overlay={position_x}:{position_y}"
+            size = f"iw*{overlay_scale}:ih*{overlay_scale}"
+        filter_complex = f"[1:v]scale={size}[ovrl];[0:v][ovrl]overlay={position_x}:{position_y}"
         
         command = [
             FFMPEG_PATH, '-y',
-            '-i', background_path,  # Input 0: background (desktop)
-            '-i', overlay_path,     # Input 1: overlay (camera)
+            *FILTER_THREAD_ARGS,
+            *HWACCEL['decode'], '-i', background_path,  # Input 0: background (desktop)
+            *HWACCEL['decode'], '-i', overlay_path,     # Input 1: overlay (camera)
             '-filter_complex', filter_complex,
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
+            '-c:v', HWACCEL['vcodec'],
+            *HWACCEL['vopts'],
+            *ENCODER_THREAD_ARGS,
             output_path
         ]
+        commands = [command]
         
-        logging.info(f"Creating overlay: {' '.join(command)}")
+        if CUDA_FILTERS:
+            # Scale and overlay on the GPU, feeding NVENC without leaving device memory.
+            # Inputs CUVID can't decode make this fail, so the CPU chain stays as fallback.
+            gpu_command = [
+                FFMPEG_PATH, '-y',
+                *CUDA_DECODE_ARGS, '-i', background_path,
+                *CUDA_DECODE_ARGS, '-i', overlay_path,
+                '-filter_complex',
+                f"[1:v]scale_cuda={size}[ovrl];[0:v][ovrl]overlay_cuda={position_x}:{position_y}",
+                '-c:v', HWACCEL['vcodec'],
+                *HWACCEL['vopts'],
+                *ENCODER_THREAD_ARGS,
+                output_path
+            ]
+            commands.insert(0, gpu_command)
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        logging.info("Creating overlay: %s", _LazyJoin(commands[0]))
+        
+        if data.get('async'):
+            return submit_job(output_name, *commands, session=session)
+        
+        result = run_encode(*commands)
+        invalidate_session(session)
         
         if result.returncode == 0:
             return jsonify({
@@ -746,6 +1645,8 @@ def overlay_videos():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error creating overlay: {e}")
         return jsonify({'error': str(e)}), 500
@@ -766,19 +1667,14 @@ def get_audio_devices():
         result = subprocess.run(
             command,
             capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            creationflags=_CREATE_NO_WINDOW
         )
         
-        # Parse device names from error output
-        import re
-        devices = []
-        for line in result.stderr.split('\n'):
-            if '(audio)' in line.lower():
-                match = re.search(r'"([^"]+)"', line)
-                if match:
-                    device_name = match.group(1)
-                    devices.append({'name': device_name, 'type': 'audio'})
+        # Parse device names from error output (ffmpeg writes UTF-8)
+        devices = [
+            {'name': match.group(1).decode('utf-8', 'replace'), 'type': 'audio'}
+            for match in _DSHOW_AUDIO_RE.finditer(result.stderr)
+        ]
         
         return jsonify({'success': True, 'devices': devices})
     except Exception as e:
@@ -789,70 +1685,41 @@ def get_audio_devices():
 def record_audio():
     """Record new audio from microphone"""
     try:
-        data = request.json
-        session = data['session']
-        duration = data.get('duration', 10)  # Default 10 seconds
-        device_name = data.get('device_name', None)  # Microphone name
-        output_name = data.get('output_name', f'recorded_audio_{datetime.now().strftime("%Y%m%d_%H%M%S")}.wav')
+        req, data = parse_request(RecordAudioReq)
+        session = req.session
+        duration = req.duration  # Default 10 seconds
+        device_name = req.device_name  # Microphone name
+        output_name = req.output_name or f'recorded_audio_{datetime.now().strftime("%Y%m%d_%H%M%S")}.wav'
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
+        session_path = _session_dir(session)
         os.makedirs(session_path, exist_ok=True)
-        output_path = os.path.join(session_path, output_name)
+        output_path = _session_file(session_path, output_name)
         
-        # Build command
-        if device_name:
-            # Use specific microphone
-            command = [
-                FFMPEG_PATH, '-y',
-                '-f', 'dshow',
-                '-i', f'audio={device_name}',
-                '-t', str(duration),
-                output_path
-            ]
-        else:
-            # Use default microphone
-            command = [
-                FFMPEG_PATH, '-y',
-                '-f', 'dshow',
-                '-list_devices', 'true',
-                '-i', 'dummy'
-            ]
-            # Get first available audio device
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            # Parse device name from error output
-            import re
-            for line in result.stderr.split('\n'):
-                if '(audio)' in line.lower():
-                    match = re.search(r'"([^"]+)".*\(audio\)', line, re.IGNORECASE)
-                    if match:
-                        device_name = match.group(1)
-                        break
-            
+        # Use the requested microphone, or the default one
+        use_default = not device_name
+        if use_default:
+            device_name = default_audio_device()
             if not device_name:
                 return jsonify({'success': False, 'error': 'No audio device found'}), 400
-            
-            command = [
-                FFMPEG_PATH, '-y',
-                '-f', 'dshow',
-                '-i', f'audio={device_name}',
-                '-t', str(duration),
-                output_path
-            ]
         
-        logging.info(f"Recording audio: {' '.join(command)}")
+        command = [
+            FFMPEG_PATH, '-y',
+            '-f', 'dshow',
+            '-i', f'audio={device_name}',
+            '-t', str(duration),
+            output_path
+        ]
         
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+        logging.info("Recording audio: %s", _LazyJoin(command))
+        
+        if data.get('async'):
+            return submit_job(output_name, command, session=session)
+        
+        result = run_ffmpeg(command)
+        invalidate_session(session)
+        if result.returncode != 0 and use_default:
+            # The cached default may have been unplugged - look it up again next time
+            forget_default_audio_device()
         
         if result.returncode == 0 and os.path.exists(output_path):
             return jsonify({
@@ -867,6 +1734,8 @@ def record_audio():
                 'error': result.stderr
             }), 500
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error recording audio: {e}")
         return jsonify({'error': str(e)}), 500
@@ -880,12 +1749,13 @@ def delete_file():
         session = data['session']
         filename = data['filename']
         
-        file_path = os.path.join(OUTPUTS_DIR, session, filename)
+        file_path = _session_file(_session_dir(session), filename)
         
         if not os.path.exists(file_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         os.remove(file_path)
+        invalidate_session(session)
         logging.info(f"Deleted file: {file_path}")
         
         return jsonify({
@@ -893,6 +1763,8 @@ def delete_file():
             'message': f'File {filename} deleted successfully'
         })
             
+    except RequestError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error deleting file: {e}")
         return jsonify({'error': str(e)}), 500
@@ -909,8 +1781,8 @@ def upload_to_canvas():
         title = data['title']
         description = data.get('description', '')
         
-        session_path = os.path.join(OUTPUTS_DIR, session)
-        file_path = os.path.join(session_path, filename)
+        session_path = _session_dir(session)
+        file_path = _session_file(session_path, filename)
         
         if not os.path.exists(file_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
@@ -984,7 +1856,7 @@ def upload_to_youtube():
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
         # Build file path
-        video_path = os.path.join(OUTPUTS_DIR, session_name, filename)
+        video_path = _session_file(_session_dir(session_name), filename)
         if not os.path.exists(video_path):
             return jsonify({'success': False, 'error': 'Video file not found'}), 404
         
@@ -1023,7 +1895,7 @@ def upload_to_vimeo():
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
         # Build file path
-        video_path = os.path.join(OUTPUTS_DIR, session_name, filename)
+        video_path = _session_file(_session_dir(session_name), filename)
         if not os.path.exists(video_path):
             return jsonify({'success': False, 'error': 'Video file not found'}), 404
         
@@ -1120,7 +1992,7 @@ def upload_to_stream():
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
         # Build file path
-        video_path = os.path.join(OUTPUTS_DIR, session_name, filename)
+        video_path = _session_file(_session_dir(session_name), filename)
         if not os.path.exists(video_path):
             return jsonify({'success': False, 'error': 'Video file not found'}), 404
         
@@ -1231,11 +2103,12 @@ def launch_recorder():
             if not os.path.exists(main_py):
                 return jsonify({'success': False, 'error': 'main.py not found'}), 404
             
-            # Launch main.py in a new process
+            # Launch main.py in a new process (the recorder is a Qt app and needs its
+            # own main thread). Reuse this interpreter instead of a PATH lookup.
             if os.name == 'nt':  # Windows
-                subprocess.Popen(['python', main_py], creationflags=subprocess.CREATE_NEW_CONSOLE)
+                subprocess.Popen([sys.executable, main_py], creationflags=subprocess.CREATE_NEW_CONSOLE)
             else:  # Unix/Mac
-                subprocess.Popen(['python', main_py])
+                subprocess.Popen([sys.executable, main_py])
             
             logging.info("Launched recording application")
             return jsonify({'success': True, 'message': 'Recording app launched'})
@@ -1247,8 +2120,21 @@ def launch_recorder():
 
 if __name__ == '__main__':
     os.makedirs(OUTPUTS_DIR, exist_ok=True)
+    cleanup_orphaned_temp_files()
     print("Starting Multi-Input Video Editor...")
     print(f"Outputs directory: {OUTPUTS_DIR}")
     print(f"FFmpeg path: {FFMPEG_PATH}")
     print("\nEditor will be available at: http://localhost:5500")
-    app.run(debug=True, port=5500)
+    
+    # Prefer a production server when waitress is installed; long FFmpeg
+    # requests then don't compete with previews on the dev server. Waitress
+    # spools large request bodies to disk, so recording uploads stream through.
+    # (hypercorn's WSGI middleware isn't suitable: it buffers whole bodies in
+    # memory and rejects anything over 64 KiB by default.)
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(debug=True, port=5500, threaded=True)
+    else:
+        serve(app, host='127.0.0.1', port=5500, threads=8,
+              max_request_body_size=MAX_UPLOAD_BYTES)
@@ -4,43 +4,368 @@ Multi-step editing workflow integrated with PyQt5
 """
 import sys
 import os
+import functools
 from datetime import datetime
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QListWidget, QGroupBox, QMessageBox, 
                             QFileDialog, QStackedWidget, QProgressBar, QComboBox,
                             QLineEdit, QSlider, QCheckBox, QTextEdit, QListWidgetItem,
-                            QSpinBox, QDoubleSpinBox, QTabWidget, QScrollArea)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPoint
+                            QSpinBox, QDoubleSpinBox, QTabWidget, QScrollArea, QStyle)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPoint, QObject, QRunnable, QThreadPool, QRect
 from PyQt5.QtGui import QFont, QPixmap, QImage, QPainter, QPen
 import subprocess
 import json
 import logging
 import tempfile
-import cv2
-
-# VLC availability check
-VLC_AVAILABLE = False
-vlc = None
+import threading
+import collections
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+# PyAV is optional - previews fall back to OpenCV (imported on first use) without it
 try:
-    import vlc as vlc_module
-    vlc = vlc_module
-    # Test if VLC libraries are actually available
+    import av
+except ImportError:
+    av = None
+
+logging.basicConfig(level=logging.INFO)
+
+_CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+# Extra Popen arguments for FFmpeg/ffprobe launches. On POSIX, CPython can
+# posix_spawn() the child instead of forking this large Qt/VLC/OpenCV process,
+# but only with close_fds=False, no start_new_session/preexec_fn and an
+# executable path that contains a directory (see resolve_executable). Leaving
+# fds open is safe: Python creates them non-inheritable (PEP 446).
+SPAWN_KWARGS = {} if os.name == 'nt' else {'close_fds': False}
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(path):
+    """Absolute path of an executable found on PATH, or path unchanged"""
+    if os.path.dirname(path):
+        return path
+    return shutil.which(path) or path
+
+
+def _start_file(path):
+    try:
+        os.startfile(path)
+    except OSError as e:
+        logging.error(f'Could not open {path}: {e}')
+
+
+def open_with_default_app(path):
+    """Open a file in its default application without waiting on the shell"""
+    if sys.platform == 'win32':
+        # ShellExecute can stall while it resolves the file association;
+        # a thread avoids that and cmd's quoting of paths with & or ^ in them
+        threading.Thread(target=_start_file, args=(path,), daemon=True).start()
+        return
+    command = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    subprocess.Popen([command, path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True, **SPAWN_KWARGS)
+
+
+@functools.lru_cache(maxsize=None)
+def load_vlc():
+    """Import python-vlc and check libvlc actually loads; returns the module or None
+    
+    Loading libvlc and its plugins takes hundreds of ms, so this runs when a
+    video preview is first needed rather than at import time.
+    """
+    try:
+        import vlc
+    except (ImportError, OSError) as e:
+        logging.warning(f'VLC not available: {str(e)}')
+        return None
     try:
-        test_instance = vlc.Instance('--quiet')
-        VLC_AVAILABLE = True
-        logging.info('VLC libraries found and working')
-        del test_instance
+        # Test if VLC libraries are actually available
+        vlc.Instance('--quiet').release()
     except Exception as e:
-        VLC_AVAILABLE = False
         logging.warning(f'VLC libraries not available: {str(e)}')
-        vlc = None
-except (ImportError, OSError) as e:
-    VLC_AVAILABLE = False
-    logging.warning(f'VLC not available: {str(e)}')
-    vlc = None
+        return None
+    logging.info('VLC libraries found and working')
+    return vlc
+
+# The Step 4 player only opens local files, so libVLC's default ~1 s input
+# caching just delays the first frame
+VLC_PREVIEW_ARGS = ['--file-caching=150', '--network-caching=150', '--live-caching=150',
+                    '--clock-jitter=0', '--clock-synchro=0', '--no-video-title-show', '--quiet']
+VLC_MEDIA_OPTIONS = (':file-caching=150', ':clock-jitter=0')
+
+# H.264 encoder settings: NVENC on supported GPUs, libx264 otherwise
+ENCODER_PROFILES = {
+    'h264_nvenc': {
+        'vcodec': 'h264_nvenc',
+        'vopts': ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'],
+        'quality': {
+            # Look-ahead and spatial AQ spend GPU time on better rate control;
+            # temporal AQ is left out as pre-Turing GPUs reject it
+            'high': ['-preset', 'p6', '-tune', 'hq', '-rc', 'vbr', '-cq', '18', '-b:v', '0',
+                     '-rc-lookahead', '20', '-spatial_aq', '1'],
+            'medium': ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0',
+                       '-rc-lookahead', '20', '-spatial_aq', '1'],
+            'low': ['-preset', 'p2', '-tune', 'hq', '-rc', 'vbr', '-cq', '28', '-b:v', '0']
+        }
+    },
+    'libx264': {
+        'vcodec': 'libx264',
+        'vopts': ['-preset', 'fast', '-crf', '23'],
+        'quality': {
+            'high': ['-crf', '18', '-preset', 'slow'],
+            'medium': ['-crf', '23', '-preset', 'medium'],
+            'low': ['-crf', '28', '-preset', 'fast']
+        }
+    }
+}
+
+
+@functools.lru_cache(maxsize=None)
+def detect_encoder(ffmpeg_path):
+    """Use h264_nvenc when FFmpeg has it and the GPU can run it, otherwise libx264"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+        if 'h264_nvenc' in result.stdout:
+            # Being compiled in doesn't mean an NVIDIA GPU is present - try a tiny encode
+            probe = subprocess.run(
+                [ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                 '-c:v', 'h264_nvenc', '-f', 'null', '-'],
+                capture_output=True, timeout=10,
+                creationflags=_CREATE_NO_WINDOW
+            )
+            if probe.returncode == 0:
+                logging.info('Using hardware encoder: h264_nvenc')
+                return ENCODER_PROFILES['h264_nvenc']
+    except Exception as e:
+        logging.warning(f'Could not probe FFmpeg encoders: {str(e)}')
+    return ENCODER_PROFILES['libx264']
+
+
+@functools.lru_cache(maxsize=None)
+def has_cuda_filters(ffmpeg_path):
+    """Check whether FFmpeg has the CUDA filters for a GPU-only overlay pipeline"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-filters'],
+            capture_output=True, text=True, timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f'Could not query FFmpeg filters: {str(e)}')
+        return False
+    return all(name in result.stdout for name in ('scale_cuda', 'overlay_cuda', 'hwupload_cuda'))
+
+
+@functools.lru_cache(maxsize=None)
+def find_ffprobe(ffmpeg_path):
+    """Find the ffprobe executable that ships next to ffmpeg"""
+    ffmpeg_dir, ffmpeg_name = os.path.split(ffmpeg_path)
+    ffprobe_path = os.path.join(ffmpeg_dir, ffmpeg_name.replace('ffmpeg', 'ffprobe'))
+    if ffmpeg_dir and not os.path.exists(ffprobe_path):
+        return 'ffprobe'
+    return ffprobe_path
+
+
+@functools.lru_cache(maxsize=None)
+def has_cuda_hwaccel(ffmpeg_path):
+    """Check whether FFmpeg can decode on the GPU with -hwaccel cuda (NVDEC)"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-hwaccels'],
+            capture_output=True, text=True, timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f'Could not query FFmpeg hwaccels: {str(e)}')
+        return False
+    if 'cuda' not in result.stdout.split():
+        return False
+    # Full builds list cuda without an NVIDIA GPU - check a CUDA device really opens
+    try:
+        probe = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+             '-init_hw_device', 'cuda', '-f', 'lavfi', '-i', 'nullsrc=size=64x64',
+             '-frames:v', '1', '-f', 'null', '-'],
+            capture_output=True, timeout=10,
+            creationflags=_CREATE_NO_WINDOW
+        )
+    except Exception as e:
+        logging.warning(f'Could not test CUDA device: {str(e)}')
+        return False
+    if probe.returncode != 0:
+        logging.info('FFmpeg lists CUDA but no CUDA device is available; decoding on the CPU')
+        return False
+    return True
+
+
+def concat_entry(path):
+    """Concat demuxer 'file' line for an absolute path, with quotes escaped"""
+    escaped = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+# Video stream fields that must match for the concat demuxer to stream-copy files
+# Stream properties that must match across inputs for a -c copy concat; the
+# audio ones matter too, or the joined file ends up broken or out of sync
+STREAM_COPY_KEYS = ('codec_type', 'codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate',
+                    'sample_rate', 'channels', 'channel_layout')
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_media_cached(ffprobe_path, path, mtime_ns, size):
+    """ffprobe a file's streams and duration; mtime and size only key the cache"""
+    result = subprocess.run(
+        [resolve_executable(ffprobe_path), '-v', 'error',
+         '-show_entries', 'stream=' + ','.join(STREAM_COPY_KEYS) + ':format=duration',
+         '-of', 'json', path],
+        capture_output=True, text=True, timeout=30,
+        creationflags=_CREATE_NO_WINDOW,
+        **SPAWN_KWARGS
+    )
+    return json.loads(result.stdout)
+
+
+def probe_media(ffprobe_path, path):
+    """ffprobe JSON for a file, probed once per version of the file; None on failure
+    
+    The result is shared between callers - do not mutate it.
+    """
+    try:
+        stat = os.stat(path)
+        return _probe_media_cached(ffprobe_path, path, stat.st_mtime_ns, stat.st_size)
+    except Exception:
+        return None
+
+
+def probe_stream_layout(ffprobe_path, path):
+    """STREAM_COPY_KEYS of each video and audio stream as a tuple, or None if there is no video"""
+    info = probe_media(ffprobe_path, path)
+    if not info:
+        return None
+    layout = tuple(tuple(stream.get(key) for key in STREAM_COPY_KEYS)
+                   for stream in info.get('streams', ())
+                   if stream.get('codec_type') in ('video', 'audio'))
+    if not any(stream[0] == 'video' for stream in layout):
+        return None
+    return layout
+
+
+def probe_duration(ffprobe_path, path):
+    """Container duration in seconds, or None if it can't be read"""
+    info = probe_media(ffprobe_path, path)
+    try:
+        return float(info['format']['duration'])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _drain_stderr(stream, tail):
+    for line in stream:
+        tail.append(line)
+    stream.close()
+
+
+# Consumer NVIDIA GPUs only allow a few concurrent NVENC sessions; processors
+# queue for a slot instead of failing when several encodes overlap
+NVENC_MAX_SESSIONS = 2
+_nvenc_sessions = threading.BoundedSemaphore(NVENC_MAX_SESSIONS)
+# stderr markers for NVENC running out of sessions (e.g. taken by another app)
+_NVENC_BUSY_MARKERS = ('OpenEncodeSessionEx failed', 'incompatible client key', 'out of memory')
+NVENC_BUSY_RETRIES = 3
+
+
+# OpenCV frames are BGR; Qt 5.14+ can wrap them as-is instead of converting to RGB first
+_QIMAGE_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+def _input_labels(count):
+    return ''.join(f'[{i}:v]' for i in range(count))
+
+
+def _xstack_grid(count, columns):
+    """xstack filter placing inputs left to right in rows of `columns`"""
+    cells = []
+    for i in range(count):
+        row, col = divmod(i, columns)
+        # x: widths of the earlier inputs in this row, y: heights of earlier rows' first inputs
+        x = '+'.join(f'w{row * columns + c}' for c in range(col)) or '0'
+        y = '+'.join(f'h{r * columns}' for r in range(row)) or '0'
+        cells.append(f'{x}_{y}')
+    return f"{_input_labels(count)}xstack=inputs={count}:layout={'|'.join(cells)}:fill=black[v]"
+
+
+# Merge filters by (layout, number of videos); combinations missing here are unsupported
+LAYOUT_FILTERS = {
+    **{('side_by_side', n): f'{_input_labels(n)}hstack=inputs={n}[v]' for n in (2, 3, 4)},
+    ('grid', 2): "[0:v][1:v]vstack[v]",
+    ('grid', 3): _xstack_grid(3, 2),
+    ('grid', 4): "[0:v][1:v]hstack[top];[2:v][3:v]hstack[bottom];[top][bottom]vstack[v]",
+    ('grid', 6): _xstack_grid(6, 3),
+    ('grid', 9): _xstack_grid(9, 3),
+}
+
+# Final exports put the moov atom first so uploads and web players can start right away
+FASTSTART_ARGS = ['-movflags', '+faststart']
+
+# Returned by WizardEditor.cached_video_frame while a frame is still being decoded
+FRAME_PENDING = object()
+
+# Decode straight into GPU memory so frames stay in VRAM until NVENC
+CUDA_DECODE_ARGS = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+
+# overlay_cuda only blends a yuva420p overlay onto a yuv420p main; NVDEC
+# outputs nv12, so convert the main video on the GPU before adding the logo
+CUDA_WATERMARK_MAIN = 'scale_cuda=format=yuv420p'
+
+
+@functools.lru_cache(maxsize=None)
+def darken_color(hex_color):
+    """Darken a hex color by 20%"""
+    hex_color = hex_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    darker = tuple(int(c * 0.8) for c in rgb)
+    return f'#{darker[0]:02x}{darker[1]:02x}{darker[2]:02x}'
+
+
+@functools.lru_cache(maxsize=None)
+def button_style(color, selector='QPushButton'):
+    """Button stylesheet for a background color, built once per color"""
+    return f'''
+            {selector} {{
+                background: {color};
+                color: white;
+                border: none;
+                padding: 12px 24px;
+                font-size: 14px;
+                font-weight: bold;
+                border-radius: 6px;
+                min-width: 120px;
+            }}
+            {selector}:hover {{
+                background: {darken_color(color)};
+            }}
+            {selector}:disabled {{
+                background: #cccccc;
+                color: #666666;
+            }}
+        '''
 
-logging.basicConfig(level=logging.INFO)
+
+# Accent colors of the wizard's buttons, all styled by one sheet set on the wizard
+# so Qt parses the rules once rather than once per button
+BUTTON_COLORS = ('#95a5a6', '#667eea', '#4caf50', '#2196F3', '#ff9800')
+
+
+@functools.lru_cache(maxsize=None)
+def wizard_stylesheet():
+    """Stylesheet matching buttons by their accent property"""
+    return ''.join(button_style(color, f'QPushButton[accent="{color}"]') for color in BUTTON_COLORS)
 
 
 class DraggableOverlayLabel(QLabel):
@@ -55,12 +380,23 @@ class DraggableOverlayLabel(QLabel):
         self.drag_start_pos = None
         self.overlay_rect = None  # Will store QRect of overlay position in display coordinates
         self.scale_info = None  # Store scale information for calculations
+        self._last_percent = None  # Last (x, y) percentage emitted while dragging
         self.setMouseTracking(True)
         
     def set_overlay_rect(self, rect, scale_info=None):
         """Store the overlay rectangle for hit testing"""
         self.overlay_rect = rect
         self.scale_info = scale_info
+        self._last_percent = None
+        if scale_info:
+            # Unpack once here instead of on every mouse move
+            self._x_offset = int(scale_info.get('x_offset', 0))
+            self._y_offset = int(scale_info.get('y_offset', 0))
+            self._inv_sx = 1.0 / scale_info['scale_x']
+            self._inv_sy = 1.0 / scale_info['scale_y']
+            # Space the overlay can move through, in video pixels
+            self._avail_w = int(scale_info['bg_width'] - scale_info['overlay_width'])
+            self._avail_h = int(scale_info['bg_height'] - scale_info['overlay_height'])
         
     def mousePressEvent(self, event):
         """Start dragging if clicked on overlay"""
@@ -74,40 +410,33 @@ class DraggableOverlayLabel(QLabel):
         """Update overlay position while dragging"""
         if self.dragging and self.drag_start_pos and self.scale_info:
             new_pos = event.pos() - self.drag_start_pos
+            x_offset = self._x_offset
+            y_offset = self._y_offset
             
-            # Get display pixmap bounds (accounting for KeepAspectRatio centering)
-            if self.pixmap():
-                pixmap_width = self.pixmap().width()
-                pixmap_height = self.pixmap().height()
-                x_offset = self.scale_info.get('x_offset', 0)
-                y_offset = self.scale_info.get('y_offset', 0)
-                
-                # Constrain to pixmap bounds
-                max_x = pixmap_width - self.overlay_rect.width() + x_offset
-                max_y = pixmap_height - self.overlay_rect.height() + y_offset
+            # Constrain to pixmap bounds (accounting for KeepAspectRatio centering)
+            pixmap = self.pixmap()
+            if pixmap:
+                max_x = pixmap.width() - self.overlay_rect.width() + x_offset
+                max_y = pixmap.height() - self.overlay_rect.height() + y_offset
                 new_pos.setX(max(x_offset, min(new_pos.x(), max_x)))
                 new_pos.setY(max(y_offset, min(new_pos.y(), max_y)))
             
             self.overlay_rect.moveTo(new_pos)
             
-            # Calculate percentage positions in original video space
-            if self.scale_info:
-                # Remove offset to get position relative to video
-                video_x = (new_pos.x() - self.scale_info['x_offset']) / self.scale_info['scale_x']
-                video_y = (new_pos.y() - self.scale_info['y_offset']) / self.scale_info['scale_y']
-                
-                # Calculate available movement space
-                available_width = self.scale_info['bg_width'] - self.scale_info['overlay_width']
-                available_height = self.scale_info['bg_height'] - self.scale_info['overlay_height']
-                
-                # Convert to percentage
-                x_percent = int((video_x / available_width) * 100) if available_width > 0 else 0
-                y_percent = int((video_y / available_height) * 100) if available_height > 0 else 0
-                
-                # Clamp to 0-100
-                x_percent = max(0, min(100, x_percent))
-                y_percent = max(0, min(100, y_percent))
-                
+            # Position relative to the video, in video pixels
+            video_x = int((new_pos.x() - x_offset) * self._inv_sx)
+            video_y = int((new_pos.y() - y_offset) * self._inv_sy)
+            
+            # Convert to a 0-100 percentage of the available movement space
+            avail_w = self._avail_w
+            avail_h = self._avail_h
+            x_percent = min(100, max(0, video_x * 100 // avail_w)) if avail_w > 0 else 0
+            y_percent = min(100, max(0, video_y * 100 // avail_h)) if avail_h > 0 else 0
+            
+            # Only notify when the position actually changed
+            percent = (x_percent, y_percent)
+            if percent != self._last_percent:
+                self._last_percent = percent
                 self.overlay_moved.emit(x_percent, y_percent)
         elif self.overlay_rect and self.overlay_rect.contains(event.pos()):
             self.setCursor(Qt.OpenHandCursor)
@@ -129,20 +458,173 @@ class DraggableOverlayLabel(QLabel):
                 self.dragging_complete.emit()
 
 
+class FrameSignals(QObject):
+    """Carries decoded preview frames from pool threads back to the GUI thread"""
+    ready = pyqtSignal(object, object)  # cache key, QImage or None
+
+
+class FrameWorker(QRunnable):
+    """Decode one preview frame on the global QThreadPool"""
+    
+    def __init__(self, decode, key, signals):
+        super().__init__()
+        self.decode = decode
+        self.key = key
+        self.signals = signals
+    
+    def run(self):
+        video_path, _, _, timestamp = self.key
+        try:
+            frame = self.decode(video_path, timestamp)
+        except Exception as e:
+            logging.error(f"Error extracting frame: {e}")
+            frame = None
+        self.signals.ready.emit(self.key, frame)
+
+
+class InstallSignals(QObject):
+    """Carries the VLC installer result back to the GUI thread"""
+    finished = pyqtSignal(bool, str)  # success, message
+
+
+class InstallWorker(QRunnable):
+    """Run the VLC installer on the global QThreadPool"""
+    
+    def __init__(self, install, signals):
+        super().__init__()
+        self.install = install
+        self.signals = signals
+    
+    def run(self):
+        try:
+            success, message = self.install()
+        except Exception as e:
+            success, message = False, str(e)
+        self.signals.finished.emit(success, message)
+
+
 class VideoProcessor(QThread):
     """Background thread for video processing operations"""
     progress_update = pyqtSignal(int, str)
     processing_complete = pyqtSignal(bool, str)
     
-    def __init__(self, ffmpeg_path, command_type, **kwargs):
+    # FFmpeg overlay x:y expressions for watermark positions (10px margin)
+    WATERMARK_POSITIONS = {
+        'top_left': '10:10',
+        'top_right': 'W-w-10:10',
+        'bottom_left': '10:H-h-10',
+        'bottom_right': 'W-w-10:H-h-10',
+        'center': '(W-w)/2:(H-h)/2'
+    }
+    
+    def __init__(self, ffmpeg_path, command_type, encoder=None, **kwargs):
         super().__init__()
         self.ffmpeg_path = ffmpeg_path
         self.command_type = command_type
+        self.encoder = encoder  # Resolved in run(), off the GUI thread, when not given
         self.params = kwargs
+    
+    def use_cuda_filters(self):
+        """Whether overlay-type steps can run decode, filters and encode all on the GPU"""
+        return self.encoder['vcodec'] == 'h264_nvenc' and has_cuda_filters(self.ffmpeg_path)
+    
+    def can_stream_copy(self, videos):
+        """Whether all videos share their video and audio stream parameters"""
+        ffprobe_path = find_ffprobe(self.ffmpeg_path)
+        with ThreadPoolExecutor(max_workers=min(8, len(videos))) as pool:
+            streams = set(pool.map(lambda video: probe_stream_layout(ffprobe_path, video), videos))
+        return len(streams) == 1 and None not in streams
+    
+    def run_ffmpeg(self, *commands, input=None, duration=None, start=50, message=''):
+        """Run FFmpeg commands in order until one succeeds; returns the last result
+        
+        With the output duration known, progress is reported from start to 95%.
+        """
+        result = None
+        for command in commands:
+            result = self.run_ffmpeg_once(command, input, duration, start, message)
+            if result.returncode == 0:
+                break
+        return result
+    
+    def run_ffmpeg_once(self, command, input=None, duration=None, start=50, message=''):
+        """Run one FFmpeg command, holding an NVENC session slot when it encodes with NVENC"""
+        if 'h264_nvenc' not in command:
+            return self.spawn_ffmpeg(command, input, duration, start, message)
+        
+        for attempt in range(NVENC_BUSY_RETRIES + 1):
+            with _nvenc_sessions:
+                result = self.spawn_ffmpeg(command, input, duration, start, message)
+            if result.returncode == 0 or not any(marker in result.stderr for marker in _NVENC_BUSY_MARKERS):
+                break
+            # Sessions held outside this process - back off and try again
+            if attempt < NVENC_BUSY_RETRIES:
+                logging.warning('NVENC sessions busy, retrying encode')
+                time.sleep(2 ** attempt)
+        return result
+    
+    def spawn_ffmpeg(self, command, input=None, duration=None, start=50, message=''):
+        """Run FFmpeg, turning its -progress output into progress_update signals
+        
+        stderr is drained on its own thread into a bounded tail, so long encodes
+        never stall on a full pipe and only the last lines are kept for errors.
+        """
+        startupinfo = None
+        if sys.platform == 'win32':
+            # Hide console window on Windows
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        
+        command = [resolve_executable(command[0]), '-progress', 'pipe:1', '-nostats', *command[1:]]
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding='utf-8',
+            errors='replace',
+            startupinfo=startupinfo,
+            **SPAWN_KWARGS
+        )
+        tail = collections.deque(maxlen=8192)  # ~1 MB of typical FFmpeg log lines
+        drain = threading.Thread(target=_drain_stderr, args=(process.stderr, tail), daemon=True)
+        drain.start()
+        if input is not None:
+            # The write may only reach the pipe when close() flushes the buffer,
+            # so both sit inside the try
+            try:
+                with process.stdin:
+                    process.stdin.write(input)
+            except BrokenPipeError:
+                pass  # FFmpeg exited without reading its input; the exit code says why
+        
+        last_pct = start
+        for line in process.stdout:
+            if not duration or not line.startswith('out_time_us='):
+                continue
+            try:
+                seconds = int(line[len('out_time_us='):]) / 1000000
+            except ValueError:  # 'N/A' before the first frame
+                continue
+            pct = start + int((95 - start) * min(seconds / duration, 1.0))
+            if pct > last_pct:
+                last_pct = pct
+                self.progress_update.emit(pct, message)
+        process.stdout.close()
+        
+        returncode = process.wait()
+        drain.join()
+        return subprocess.CompletedProcess(command, returncode, None, ''.join(tail))
+    
+    def probe_duration(self, path):
+        """Duration of a video in seconds, or None if unknown"""
+        return probe_duration(find_ffprobe(self.ffmpeg_path), path)
         
     def run(self):
         """Execute FFmpeg command based on type"""
         try:
+            if self.encoder is None:
+                self.encoder = detect_encoder(self.ffmpeg_path)
             if self.command_type == 'merge':
                 self.merge_videos()
             elif self.command_type == 'overlay':
@@ -151,6 +633,8 @@ class VideoProcessor(QThread):
                 self.add_watermark()
             elif self.command_type == 'export':
                 self.export_video()
+            elif self.command_type == 'final':
+                self.final_pipeline()
         except Exception as e:
             self.processing_complete.emit(False, str(e))
     
@@ -162,24 +646,35 @@ class VideoProcessor(QThread):
         
         self.progress_update.emit(10, "Preparing merge...")
         
-        # Create concat file for simple merge
+        # Simple merge: feed the concat list to ffmpeg's stdin instead of a temp file
+        concat_input = None
         if layout == 'sequential':
-            concat_file = output.replace('.mp4', '_concat.txt')
-            with open(concat_file, 'w') as f:
-                for video in videos:
-                    f.write(f"file '{video}'\n")
+            concat_input = ''.join(map(concat_entry, videos))
             
             command = [
                 self.ffmpeg_path, '-y',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', concat_file,
-                '-c', 'copy',
-                output
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0'
             ]
+            if self.can_stream_copy(videos):
+                # Matching streams just need remuxing - no decode or encode
+                command.extend(['-c', 'copy', output])
+            else:
+                # Stream-copying mismatched files gives a broken output, so re-encode
+                command.extend([
+                    '-c:v', self.encoder['vcodec'],
+                    *self.encoder['vopts'],
+                    '-c:a', 'aac',
+                    output
+                ])
         else:
             # Grid or side-by-side layout
             filter_complex = self.build_layout_filter(videos, layout)
+            if filter_complex is None:
+                self.processing_complete.emit(False, f"Merge failed: {len(videos)} videos can't be merged {layout.replace('_', ' ')}")
+                return
             command = [
                 self.ffmpeg_path, '-y'
             ]
@@ -188,17 +683,20 @@ class VideoProcessor(QThread):
             
             command.extend([
                 '-filter_complex', filter_complex,
-                '-c:v', 'libx264',
-                '-preset', 'fast',
-                '-crf', '23',
+                '-c:v', self.encoder['vcodec'],
+                *self.encoder['vopts'],
                 output
             ])
         
         self.progress_update.emit(30, "Merging videos...")
-        # Hide console window on Windows
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        result = subprocess.run(command, capture_output=True, text=True, startupinfo=startupinfo if sys.platform == 'win32' else None)
+        durations = [self.probe_duration(video) for video in videos]
+        if None in durations:
+            duration = None
+        else:
+            # Sequential merges play back to back, layouts play side by side
+            duration = sum(durations) if layout == 'sequential' else max(durations, default=None)
+        result = self.run_ffmpeg(command, input=concat_input, duration=duration,
+                                 start=30, message="Merging videos...")
         
         if result.returncode == 0:
             self.progress_update.emit(100, "Merge complete!")
@@ -207,18 +705,8 @@ class VideoProcessor(QThread):
             self.processing_complete.emit(False, f"Merge failed: {result.stderr}")
     
     def build_layout_filter(self, videos, layout):
-        """Build FFmpeg filter for video layout"""
-        num_videos = len(videos)
-        
-        if layout == 'side_by_side' and num_videos == 2:
-            return "[0:v][1:v]hstack[v]"
-        elif layout == 'grid':
-            if num_videos == 2:
-                return "[0:v][1:v]vstack[v]"
-            elif num_videos == 4:
-                return "[0:v][1:v]hstack[top];[2:v][3:v]hstack[bottom];[top][bottom]vstack[v]"
-        
-        return "[0:v]"
+        """Build FFmpeg filter for video layout; None if the combination is unsupported"""
+        return LAYOUT_FILTERS.get((layout, len(videos)))
     
     def apply_overlay(self):
         """Apply picture-in-picture overlay"""
@@ -245,18 +733,32 @@ class VideoProcessor(QThread):
             f'[1:v]scale=iw*{size}:ih*{size}[overlay];[0:v][overlay]overlay={x_pos}:{y_pos}[v]',
             '-map', '[v]',
             '-map', '0:a?',
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
+            '-c:v', self.encoder['vcodec'],
+            *self.encoder['vopts'],
             '-c:a', 'aac',
             output
         ]
+        commands = [command]
+        
+        if self.use_cuda_filters():
+            # Same graph on the GPU; the CPU command stays as fallback for inputs CUVID can't decode
+            commands.insert(0, [
+                self.ffmpeg_path, '-y',
+                *CUDA_DECODE_ARGS, '-i', background,
+                *CUDA_DECODE_ARGS, '-i', overlay,
+                '-filter_complex',
+                f'[1:v]scale_cuda=iw*{size}:ih*{size}[overlay];[0:v][overlay]overlay_cuda={x_pos}:{y_pos}[v]',
+                '-map', '[v]',
+                '-map', '0:a?',
+                '-c:v', self.encoder['vcodec'],
+                *self.encoder['vopts'],
+                '-c:a', 'aac',
+                output
+            ])
         
         self.progress_update.emit(50, "Processing overlay...")
-        # Hide console window on Windows
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        result = subprocess.run(command, capture_output=True, text=True, startupinfo=startupinfo if sys.platform == 'win32' else None)
+        result = self.run_ffmpeg(*commands, duration=self.probe_duration(background),
+                                 message="Processing overlay...")
         
         if result.returncode == 0:
             self.progress_update.emit(100, "Overlay applied!")
@@ -274,37 +776,48 @@ class VideoProcessor(QThread):
         
         self.progress_update.emit(20, "Adding watermark...")
         
-        positions = {
-            'top_left': '10:10',
-            'top_right': 'W-w-10:10',
-            'bottom_left': '10:H-h-10',
-            'bottom_right': 'W-w-10:H-h-10',
-            'center': '(W-w)/2:(H-h)/2'
-        }
+        pos_str = self.WATERMARK_POSITIONS.get(position, 'W-w-10:10')
         
-        pos_str = positions.get(position, 'W-w-10:10')
-        
-        # Scale watermark to 15% of video width (maintaining aspect ratio)
+        # Scale watermark to 15% of video width (maintaining aspect ratio).
+        # The still image is a single input frame, so this chain runs once and
+        # overlay repeats the result - don't add -loop 1, that would redo it per frame.
+        logo_filter = f'[1:v]scale=iw*0.15:ih*0.15,format=rgba,colorchannelmixer=aa={opacity}'
         command = [
             self.ffmpeg_path, '-y',
             '-i', input_video,
             '-i', watermark,
             '-filter_complex',
-            f'[1:v]scale=iw*0.15:ih*0.15,format=rgba,colorchannelmixer=aa={opacity}[logo];[0:v][logo]overlay={pos_str}[v]',
+            f'{logo_filter}[logo];[0:v][logo]overlay={pos_str}[v]',
             '-map', '[v]',
             '-map', '0:a?',
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
+            '-c:v', self.encoder['vcodec'],
+            *self.encoder['vopts'],
             '-c:a', 'copy',
             output
         ]
+        commands = [command]
+        
+        if self.use_cuda_filters():
+            # The video stays on the GPU. The small logo's alpha is prepared on
+            # the CPU and uploaded; there is no CUDA colorchannelmixer.
+            commands.insert(0, [
+                self.ffmpeg_path, '-y',
+                *CUDA_DECODE_ARGS, '-i', input_video,
+                '-i', watermark,
+                '-filter_complex',
+                f'[0:v]{CUDA_WATERMARK_MAIN}[main];'
+                f'{logo_filter},format=yuva420p,hwupload_cuda[logo];[main][logo]overlay_cuda={pos_str}[v]',
+                '-map', '[v]',
+                '-map', '0:a?',
+                '-c:v', self.encoder['vcodec'],
+                *self.encoder['vopts'],
+                '-c:a', 'copy',
+                output
+            ])
         
         self.progress_update.emit(50, "Processing watermark...")
-        # Hide console window on Windows
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        result = subprocess.run(command, capture_output=True, text=True, startupinfo=startupinfo if sys.platform == 'win32' else None)
+        result = self.run_ffmpeg(*commands, duration=self.probe_duration(input_video),
+                                 message="Processing watermark...")
         
         if result.returncode == 0:
             self.progress_update.emit(100, "Watermark added!")
@@ -312,33 +825,100 @@ class VideoProcessor(QThread):
         else:
             self.processing_complete.emit(False, f"Watermark failed: {result.stderr}")
     
+    def final_pipeline(self):
+        """Overlay, watermark and export straight from the sources in one FFmpeg pass
+        
+        Replaces the overlay -> watermark -> export chain, which decodes and
+        re-encodes the whole video three times.
+        """
+        background = self.params['background']
+        overlay = self.params.get('overlay')
+        watermark = self.params.get('watermark')
+        output = self.params['output']
+        quality = self.params.get('quality', 'high')
+        
+        self.progress_update.emit(20, "Preparing single-pass export...")
+        
+        def build(gpu):
+            # Same graph for CPU and GPU; the GPU variant swaps in CUDA filters
+            decode = CUDA_DECODE_ARGS if gpu else []
+            suffix = '_cuda' if gpu else ''
+            inputs = [*decode, '-i', background]
+            chains = []
+            video = '[0:v]'
+            if overlay:
+                size = self.params.get('size', 0.35)
+                x_pos = f"(W-w)*{self.params.get('x_percent', 75)}/100"
+                y_pos = f"(H-h)*{self.params.get('y_percent', 75)}/100"
+                inputs += [*decode, '-i', overlay]
+                chains.append(f'[1:v]scale{suffix}=iw*{size}:ih*{size}[ov];'
+                              f'{video}[ov]overlay{suffix}={x_pos}:{y_pos}[bg]')
+                video = '[bg]'
+            if watermark:
+                index = 2 if overlay else 1
+                opacity = self.params.get('opacity', 0.7)
+                pos_str = self.WATERMARK_POSITIONS.get(self.params.get('position'), 'W-w-10:10')
+                # The logo is a still image - its alpha is always prepared on the CPU
+                upload = ',format=yuva420p,hwupload_cuda' if gpu else ''
+                if gpu:
+                    chains.append(f'{video}{CUDA_WATERMARK_MAIN}[main]')
+                    video = '[main]'
+                inputs += ['-i', watermark]
+                chains.append(f'[{index}:v]scale=iw*0.15:ih*0.15,format=rgba,colorchannelmixer=aa={opacity}{upload}[wm];'
+                              f'{video}[wm]overlay{suffix}={pos_str}[v]')
+                video = '[v]'
+            
+            filter_args = ['-filter_complex', ';'.join(chains), '-map', video] if chains else ['-map', '0:v']
+            quality_settings = self.encoder['quality']
+            return [
+                self.ffmpeg_path, '-y',
+                *inputs,
+                *filter_args,
+                '-map', '0:a?',
+                '-c:v', self.encoder['vcodec'],
+                *quality_settings.get(quality, quality_settings['medium']),
+                '-c:a', 'aac',
+                '-b:a', '192k',
+                *FASTSTART_ARGS,
+                output
+            ]
+        
+        commands = [build(gpu=False)]
+        if (overlay or watermark) and self.use_cuda_filters():
+            commands.insert(0, build(gpu=True))
+        
+        self.progress_update.emit(30, "Exporting video...")
+        result = self.run_ffmpeg(*commands, duration=self.probe_duration(background),
+                                 start=30, message="Exporting video...")
+        
+        if result.returncode == 0:
+            self.progress_update.emit(100, "Export complete!")
+            self.processing_complete.emit(True, output)
+        else:
+            self.processing_complete.emit(False, f"Export failed: {result.stderr}")
+    
     def export_video(self):
         """Export final video with quality settings"""
         input_video = self.params['input']
         output = self.params['output']
         quality = self.params.get('quality', 'high')
         
-        quality_settings = {
-            'high': ['-crf', '18', '-preset', 'slow'],
-            'medium': ['-crf', '23', '-preset', 'medium'],
-            'low': ['-crf', '28', '-preset', 'fast']
-        }
+        quality_settings = self.encoder['quality']
         
         command = [
             self.ffmpeg_path, '-y',
             '-i', input_video,
-            '-c:v', 'libx264',
+            '-c:v', self.encoder['vcodec'],
             *quality_settings.get(quality, quality_settings['medium']),
             '-c:a', 'aac',
             '-b:a', '192k',
+            *FASTSTART_ARGS,
             output
         ]
         
         self.progress_update.emit(50, "Exporting video...")
-        # Hide console window on Windows
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        result = subprocess.run(command, capture_output=True, text=True, startupinfo=startupinfo if sys.platform == 'win32' else None)
+        result = self.run_ffmpeg(command, duration=self.probe_duration(input_video),
+                                 message="Exporting video...")
         
         if result.returncode == 0:
             self.progress_update.emit(100, "Export complete!")
@@ -350,6 +930,9 @@ class VideoProcessor(QThread):
 class WizardEditor(QWidget):
     """Main wizard-style editor widget"""
     
+    vlc_loaded = pyqtSignal()  # Emitted from the libVLC loader thread
+    playback_changed = pyqtSignal(bool)  # Emitted from libVLC's event thread: playing or not
+    
     def __init__(self, session_folder=None, ffmpeg_path="ffmpeg"):
         super().__init__()
         self.session_folder = session_folder
@@ -361,9 +944,30 @@ class WizardEditor(QWidget):
             'merged_video': None,
             'overlay_video': None,
             'watermarked_video': None,
+            'watermark_rendered': False,  # Step 3 produced a watermarked file, not a passthrough
             'final_video': None
         }
         
+        # Decoded preview frames keyed by (path, mtime, size, timestamp), least recently used first
+        self._frame_cache = collections.OrderedDict()
+        # Frames being decoded in the background -> callbacks to run once ready
+        self._frame_pending = {}
+        self._frame_failed = set()
+        self._frame_signals = FrameSignals(self)
+        self._frame_signals.ready.connect(self._on_frame_ready)
+        self._step1_request = 0  # Bumped per Step 1 click so stale previews are dropped
+        self._watermark_pixmap = (None, None)  # (path, mtime, width) -> scaled logo
+        self._scaled_pixmaps = {}  # (frame cache key, width, height) -> QPixmap
+        
+        # Coalesce bursts of step 2 control changes into one preview redraw
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.timeout.connect(self._do_update_overlay_preview)
+        # Same for step 3 watermark controls
+        self._watermark_timer = QTimer(self)
+        self._watermark_timer.setSingleShot(True)
+        self._watermark_timer.timeout.connect(self._do_update_watermark_preview)
+        
         # Initialize overlay scale info
         self.overlay_scale_info = {
             'scale_x': 1.0,
@@ -372,8 +976,22 @@ class WizardEditor(QWidget):
             'y_offset': 0
         }
         
+        self._vlc_loading = False
+        self._preview_key = None  # File identity of the video Step 4 last loaded
+        self.vlc_loaded.connect(self._on_vlc_loaded)
+        self._vlc_playing = False
+        self.playback_changed.connect(self._on_playback_changed)
+        
+        # File type icons for the Step 1 lists, looked up once
+        self._video_icon = self.style().standardIcon(QStyle.SP_MediaPlay)
+        self._audio_icon = self.style().standardIcon(QStyle.SP_MediaVolume)
+        
         self.init_ui()
         
+        # Probe the encoder (an FFmpeg test encode) in the background so the
+        # first processing step usually finds it cached
+        threading.Thread(target=detect_encoder, args=(ffmpeg_path,), daemon=True).start()
+        
         if session_folder:
             self.load_session_files()
     
@@ -381,6 +999,7 @@ class WizardEditor(QWidget):
         """Initialize the wizard UI"""
         self.setWindowTitle('Hallmark Record - Video Editor Wizard')
         self.setGeometry(100, 100, 1400, 900)
+        self.setStyleSheet(wizard_stylesheet())
         
         main_layout = QVBoxLayout(self)
         
@@ -427,7 +1046,7 @@ class WizardEditor(QWidget):
         nav_layout = QHBoxLayout()
         
         self.prev_btn = QPushButton('◀ Previous')
-        self.prev_btn.setStyleSheet(self.get_button_style('#95a5a6'))
+        self.style_button(self.prev_btn, '#95a5a6')
         self.prev_btn.clicked.connect(self.previous_step)
         self.prev_btn.setEnabled(False)
         nav_layout.addWidget(self.prev_btn)
@@ -435,12 +1054,12 @@ class WizardEditor(QWidget):
         nav_layout.addStretch()
         
         self.next_btn = QPushButton('Next ▶')
-        self.next_btn.setStyleSheet(self.get_button_style('#667eea'))
+        self.style_button(self.next_btn, '#667eea')
         self.next_btn.clicked.connect(self.next_step)
         nav_layout.addWidget(self.next_btn)
         
         self.finish_btn = QPushButton('✓ Finish')
-        self.finish_btn.setStyleSheet(self.get_button_style('#4caf50'))
+        self.style_button(self.finish_btn, '#4caf50')
         self.finish_btn.clicked.connect(self.finish_wizard)
         self.finish_btn.setVisible(False)
         nav_layout.addWidget(self.finish_btn)
@@ -458,32 +1077,18 @@ class WizardEditor(QWidget):
     
     def get_button_style(self, color):
         """Get button stylesheet"""
-        return f'''
-            QPushButton {{
-                background: {color};
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 6px;
-                min-width: 120px;
-            }}
-            QPushButton:hover {{
-                background: {self.darken_color(color)};
-            }}
-            QPushButton:disabled {{
-                background: #cccccc;
-                color: #666666;
-            }}
-        '''
+        return button_style(color)
+    
+    def style_button(self, button, color):
+        """Give a button the wizard's style for its accent color"""
+        if color in BUTTON_COLORS:
+            button.setProperty('accent', color)
+        else:
+            button.setStyleSheet(button_style(color))
     
     def darken_color(self, hex_color):
         """Darken a hex color by 20%"""
-        hex_color = hex_color.lstrip('#')
-        rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        darker = tuple(int(c * 0.8) for c in rgb)
-        return f'#{darker[0]:02x}{darker[1]:02x}{darker[2]:02x}'
+        return darken_color(hex_color)
     
     def create_step1_verify(self):
         """Step 1: Verify and re-record if needed"""
@@ -504,6 +1109,7 @@ class WizardEditor(QWidget):
         video_layout = QVBoxLayout()
         
         self.video_list = QListWidget()
+        self.video_list.setUniformItemSizes(True)  # Single-line rows; skip per-item size hints
         self.video_list.itemDoubleClicked.connect(self.preview_video)
         self.video_list.itemClicked.connect(self.show_video_preview_step1)
         video_layout.addWidget(self.video_list)
@@ -546,6 +1152,7 @@ class WizardEditor(QWidget):
         audio_layout = QVBoxLayout()
         
         self.audio_list = QListWidget()
+        self.audio_list.setUniformItemSizes(True)  # Single-line rows; skip per-item size hints
         self.audio_list.itemDoubleClicked.connect(self.preview_audio)
         audio_layout.addWidget(self.audio_list)
         
@@ -754,7 +1361,7 @@ class WizardEditor(QWidget):
         
         # Apply button
         apply_btn = QPushButton('✨ Apply Watermark')
-        apply_btn.setStyleSheet(self.get_button_style('#667eea'))
+        self.style_button(apply_btn, '#667eea')
         apply_btn.clicked.connect(self.apply_watermark)
         layout.addWidget(apply_btn)
         
@@ -793,41 +1400,12 @@ class WizardEditor(QWidget):
         preview_group = QGroupBox('Video Preview')
         preview_layout = QVBoxLayout()
         
-        # VLC video player widget
-        if VLC_AVAILABLE:
-            self.vlc_instance = vlc.Instance()
-            self.vlc_player = self.vlc_instance.media_player_new()
-            
-            # Create video frame widget
-            self.video_frame = QWidget()
-            self.video_frame.setStyleSheet('border: 2px solid #ccc; background: #000;')
-            self.video_frame.setMinimumHeight(400)
-            preview_layout.addWidget(self.video_frame)
-        else:
-            # Fallback to static thumbnail if VLC not available
-            vlc_layout = QVBoxLayout()
-            
-            self.step4_thumbnail = QLabel()
-            self.step4_thumbnail.setAlignment(Qt.AlignCenter)
-            self.step4_thumbnail.setStyleSheet('border: 2px solid #ccc; background: #000; color: #fff; padding: 20px;')
-            self.step4_thumbnail.setMinimumHeight(350)
-            self.step4_thumbnail.setWordWrap(True)
-            self.step4_thumbnail.setText(
-                '⚠️ Live Video Preview Unavailable\n\n'
-                'VLC media player is required for live video playback.\n\n'
-                'Using static thumbnail preview instead.\n'
-                'Click "Install VLC" below to enable live preview.'
-            )
-            vlc_layout.addWidget(self.step4_thumbnail)
-            
-            # Install VLC button
-            install_vlc_btn = QPushButton('📥 Install VLC Media Player')
-            install_vlc_btn.setStyleSheet(self.get_button_style('#ff9800'))
-            install_vlc_btn.clicked.connect(self.install_vlc)
-            vlc_layout.addWidget(install_vlc_btn)
-            
-            preview_layout.addLayout(vlc_layout)
-            self.vlc_player = None
+        # VLC player or thumbnail fallback, built on first use by ensure_video_player()
+        self.step4_player_layout = QVBoxLayout()
+        preview_layout.addLayout(self.step4_player_layout)
+        self.vlc_instance = None
+        self.vlc_player = None
+        self.step4_thumbnail = None
         
         preview_group.setLayout(preview_layout)
         layout.addWidget(preview_group)
@@ -894,6 +1472,11 @@ class WizardEditor(QWidget):
         quality_layout.addWidget(self.quality_combo)
         export_layout.addLayout(quality_layout)
         
+        # Render overlay + watermark + export from the sources in one pass
+        self.single_pass_check = QCheckBox('Fast (single-pass): render overlay and watermark straight from the sources')
+        self.single_pass_check.setToolTip('Uses the Step 2 and Step 3 settings and skips re-encoding intermediate files')
+        export_layout.addWidget(self.single_pass_check)
+        
         # Output folder
         folder_layout = QHBoxLayout()
         folder_layout.addWidget(QLabel('Save to:'))
@@ -910,7 +1493,7 @@ class WizardEditor(QWidget):
         
         # Export button
         export_btn = QPushButton('💾 Export Video')
-        export_btn.setStyleSheet(self.get_button_style('#4caf50'))
+        self.style_button(export_btn, '#4caf50')
         export_btn.clicked.connect(self.export_final)
         layout.addWidget(export_btn)
         
@@ -939,7 +1522,7 @@ class WizardEditor(QWidget):
         upload_layout.addLayout(dest_layout)
         
         upload_btn = QPushButton('☁️ Upload Now')
-        upload_btn.setStyleSheet(self.get_button_style('#2196F3'))
+        self.style_button(upload_btn, '#2196F3')
         upload_btn.clicked.connect(self.upload_video)
         upload_layout.addWidget(upload_btn)
         
@@ -966,27 +1549,40 @@ class WizardEditor(QWidget):
         if not self.session_folder or not os.path.exists(self.session_folder):
             return
         
-        self.video_list.clear()
-        self.audio_list.clear()
-        self.bg_video_combo.clear()
-        self.overlay_video_combo.clear()
-        
-        for filename in os.listdir(self.session_folder):
-            filepath = os.path.join(self.session_folder, filename)
+        with os.scandir(self.session_folder) as it:
+            entries = [(entry.name, entry.path) for entry in it if entry.is_file()]
+        videos = [entry for entry in entries if entry[0].endswith('.mp4')]
+        audios = [entry for entry in entries if entry[0].endswith(('.wav', '.mp3'))]
+        self.current_project['source_videos'] = [filepath for _, filepath in videos]
+        self.current_project['source_audio'] = [filepath for _, filepath in audios]
+        
+        # Fill every widget with updates and combo signals off, then refresh once
+        widgets = (self.video_list, self.audio_list, self.bg_video_combo, self.overlay_video_combo)
+        for widget in widgets:
+            widget.setUpdatesEnabled(False)
+            widget.blockSignals(True)
+        try:
+            for widget in widgets:
+                widget.clear()
             
-            if filename.endswith('.mp4'):
-                item = QListWidgetItem(f"🎥 {filename}")
+            for filename, filepath in videos:
+                item = QListWidgetItem(self._video_icon, filename)
                 item.setData(Qt.UserRole, filepath)
                 self.video_list.addItem(item)
                 self.bg_video_combo.addItem(filename, filepath)
                 self.overlay_video_combo.addItem(filename, filepath)
-                self.current_project['source_videos'].append(filepath)
-                
-            elif filename.endswith(('.wav', '.mp3')):
-                item = QListWidgetItem(f"🎤 {filename}")
+            
+            for filename, filepath in audios:
+                item = QListWidgetItem(self._audio_icon, filename)
                 item.setData(Qt.UserRole, filepath)
                 self.audio_list.addItem(item)
-                self.current_project['source_audio'].append(filepath)
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+                widget.setUpdatesEnabled(True)
+        
+        # The combo selections changed while their signals were blocked
+        self.update_overlay_preview()
     
     def next_step(self):
         """Move to next wizard step"""
@@ -1024,11 +1620,7 @@ class WizardEditor(QWidget):
             
             # If no overlay was applied, use the appropriate source video
             if not self.current_project.get('overlay_video'):
-                # Priority: primary_video (selected in Step 1) > merged_video > bg_video_combo > first source
-                source_video = (self.current_project.get('primary_video') or
-                               self.current_project.get('merged_video') or
-                               self.bg_video_combo.currentData() or
-                               (self.current_project['source_videos'][0] if self.current_project['source_videos'] else None))
+                source_video = self.base_source_video()
                 if source_video:
                     self.current_project['overlay_video'] = source_video
         
@@ -1060,6 +1652,16 @@ class WizardEditor(QWidget):
             self.stacked_widget.setCurrentIndex(current + 1)
             self.update_navigation()
     
+    def base_source_video(self):
+        """Video to edit when no overlay is rendered
+        
+        Priority: primary_video (selected in Step 1) > merged_video > bg_video_combo > first source
+        """
+        return (self.current_project.get('primary_video') or
+                self.current_project.get('merged_video') or
+                self.bg_video_combo.currentData() or
+                (self.current_project['source_videos'][0] if self.current_project['source_videos'] else None))
+    
     def previous_step(self):
         """Move to previous wizard step"""
         current = self.stacked_widget.currentIndex()
@@ -1089,8 +1691,13 @@ class WizardEditor(QWidget):
             self.next_btn.setVisible(True)
             self.finish_btn.setVisible(False)
         
-        # Auto-load preview when entering Step 4
-        if current == 3:  # Step 4 (0-indexed)
+        # Load libvlc in the background one step ahead, so users who stop
+        # earlier never pay for it and Step 4 doesn't wait on it
+        if current == 2:
+            self.start_vlc_loader()
+        
+        # Auto-load preview when entering Step 4, unless nothing changed since the last visit
+        if current == 3 and not self.preview_is_current():  # Step 4 (0-indexed)
             QTimer.singleShot(100, self.reload_preview)
     
     def finish_wizard(self):
@@ -1115,8 +1722,7 @@ class WizardEditor(QWidget):
     
     def preview_video(self, item):
         """Open video in default player"""
-        filepath = item.data(Qt.UserRole)
-        os.startfile(filepath)
+        open_with_default_app(item.data(Qt.UserRole))
     
     def preview_selected_audio(self):
         """Preview selected audio file"""
@@ -1126,8 +1732,7 @@ class WizardEditor(QWidget):
     
     def preview_audio(self, item):
         """Open audio in default player"""
-        filepath = item.data(Qt.UserRole)
-        os.startfile(filepath)
+        open_with_default_app(item.data(Qt.UserRole))
     
     def rerecord_video(self):
         """Rerecord video (opens main recorder)"""
@@ -1155,7 +1760,7 @@ class WizardEditor(QWidget):
             return
         
         # Ask for layout
-        layout, ok = QMessageBox.question(
+        layout = QMessageBox.question(
             self,
             'Merge Layout',
             'How would you like to merge the videos?\n\nYes = Side by Side\nNo = Sequential (one after another)',
@@ -1164,6 +1769,10 @@ class WizardEditor(QWidget):
         
         videos = [item.data(Qt.UserRole) for item in selected_items]
         layout_type = 'side_by_side' if layout == QMessageBox.Yes else 'sequential'
+        if layout_type != 'sequential' and (layout_type, len(videos)) not in LAYOUT_FILTERS:
+            QMessageBox.warning(self, 'Unsupported Layout',
+                                f'Side by side merges support up to 4 videos ({len(videos)} selected).')
+            return
         
         output_path = os.path.join(
             self.session_folder,
@@ -1269,17 +1878,20 @@ class WizardEditor(QWidget):
     def show_result_preview(self, video_path, message):
         """Show a quick preview of the result"""
         try:
-            frame = self.extract_video_frame(video_path)
-            if frame is not None:
-                pixmap = QPixmap.fromImage(frame)
-                self.overlay_preview_label.setPixmap(pixmap.scaled(
-                    self.overlay_preview_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                ))
-                QMessageBox.information(self, 'Success', message)
-        except:
-            QMessageBox.information(self, 'Success', message)
+            self._show_result_frame(video_path)
+        except Exception as e:
+            logging.error(f"Preview error: {e}")
+        QMessageBox.information(self, 'Success', message)
+    
+    def _show_result_frame(self, video_path):
+        """Show the overlay result's frame once decoded, unless a newer overlay replaced it"""
+        if video_path != self.current_project.get('overlay_video'):
+            return
+        frame = self.cached_video_frame(video_path, lambda: self._show_result_frame(video_path))
+        if frame is FRAME_PENDING:
+            self.overlay_preview_label.setText('Loading preview...')
+        elif frame:
+            self.overlay_preview_label.setPixmap(self.scaled_frame_pixmap(frame, self.overlay_preview_label.size()))
     
     # ===== Step 3 Methods =====
     
@@ -1359,6 +1971,7 @@ class WizardEditor(QWidget):
         
         if success:
             self.current_project['watermarked_video'] = result
+            self.current_project['watermark_rendered'] = True
             self.load_session_files()
             
             # Update preview
@@ -1374,13 +1987,22 @@ class WizardEditor(QWidget):
     
     # ===== Step 4 Methods =====
     
+    def current_preview_video(self):
+        """The most recent processed video, or the first source video"""
+        return (self.current_project.get('watermarked_video') or
+                self.current_project.get('overlay_video') or
+                self.current_project.get('merged_video') or
+                (self.current_project['source_videos'][0] if self.current_project['source_videos'] else None))
+    
+    def preview_is_current(self):
+        """True if Step 4 already shows the current video as it is on disk"""
+        preview_video = self.current_preview_video()
+        return (self._preview_key is not None and preview_video is not None and
+                self._preview_key == self._frame_key(preview_video, None))
+    
     def reload_preview(self):
         """Load preview of current video"""
-        # Get the most recent processed video
-        preview_video = (self.current_project.get('watermarked_video') or
-                        self.current_project.get('overlay_video') or
-                        self.current_project.get('merged_video') or
-                        (self.current_project['source_videos'][0] if self.current_project['source_videos'] else None))
+        preview_video = self.current_preview_video()
         
         if not preview_video or not os.path.exists(preview_video):
             QMessageBox.warning(self, 'No Video', 'No video available to preview. Complete previous steps first.')
@@ -1388,8 +2010,15 @@ class WizardEditor(QWidget):
         
         self.current_project['final_video'] = preview_video
         
+        # Don't block the GUI thread on libvlc; come back once it is loaded
+        if self.vlc_player is None and self.step4_thumbnail is None and not load_vlc.cache_info().currsize:
+            self.info_text.setPlainText('Loading video player...')
+            self.start_vlc_loader()
+            return
+        
         # Load video into VLC player if available
-        if VLC_AVAILABLE and self.vlc_player:
+        self.ensure_video_player()
+        if self.vlc_player:
             try:
                 # Set the video frame as output window
                 if sys.platform.startswith('linux'):
@@ -1401,28 +2030,20 @@ class WizardEditor(QWidget):
                 
                 # Load and play video
                 media = self.vlc_instance.media_new(preview_video)
+                for option in VLC_MEDIA_OPTIONS:
+                    media.add_option(option)
                 self.vlc_player.set_media(media)
                 self.vlc_player.play()
-                self.play_pause_btn.setText('⏸️ Pause')
             except Exception as e:
                 logging.error(f'VLC playback error: {str(e)}')
                 QMessageBox.warning(self, 'Playback Error', 
                     f'Could not play video with VLC.\n\n{str(e)}\n\nUse "Open in External Player" instead.')
         else:
             # Fallback to static thumbnail
-            frame = self.extract_video_frame(preview_video)
-            if frame:
-                pixmap = QPixmap.fromImage(frame)
-                self.step4_thumbnail.setPixmap(pixmap.scaled(
-                    self.step4_thumbnail.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                ))
-            else:
-                self.step4_thumbnail.setText(
-                    '⚠️ Could not load video preview\n\n'
-                    'Click "Open in External Player" to view the video.'
-                )
+            self.show_step4_thumbnail(preview_video)
+        
+        # Remember what is shown so returning to Step 4 can skip the reload
+        self._preview_key = self._frame_key(preview_video, None)
         
         # Show info
         file_size = os.path.getsize(preview_video) / (1024 * 1024)
@@ -1432,25 +2053,108 @@ class WizardEditor(QWidget):
             f"Path: {preview_video}"
         )
     
+    def show_step4_thumbnail(self, preview_video):
+        """Show the Step 4 fallback thumbnail, decoding it in the background on a cache miss"""
+        if preview_video != self.current_project.get('final_video'):
+            return  # A newer reload replaced this preview
+        frame = self.cached_video_frame(preview_video, lambda: self.show_step4_thumbnail(preview_video))
+        if frame is FRAME_PENDING:
+            self.step4_thumbnail.setText('Loading preview...')
+        elif frame:
+            self.step4_thumbnail.setPixmap(self.scaled_frame_pixmap(frame, self.step4_thumbnail.size()))
+        else:
+            self.step4_thumbnail.setText(
+                '⚠️ Could not load video preview\n\n'
+                'Click "Open in External Player" to view the video.'
+            )
+    
+    def start_vlc_loader(self):
+        """Load libvlc on a background thread unless it is loaded or loading already"""
+        if self._vlc_loading or load_vlc.cache_info().currsize:
+            return
+        self._vlc_loading = True
+        
+        def load():
+            load_vlc()
+            self.vlc_loaded.emit()
+        threading.Thread(target=load, daemon=True).start()
+    
+    def _on_vlc_loaded(self):
+        """Show the Step 4 preview if the user is waiting on it"""
+        self._vlc_loading = False
+        if self.stacked_widget.currentIndex() == 3:
+            self.reload_preview()
+    
+    def ensure_video_player(self):
+        """Set up the Step 4 player the first time a preview is shown"""
+        if self.vlc_player is not None or self.step4_thumbnail is not None:
+            return
+        
+        vlc = load_vlc()
+        if vlc is not None:
+            self.vlc_instance = vlc.Instance(VLC_PREVIEW_ARGS)
+            self.vlc_player = self.vlc_instance.media_player_new()
+            
+            # Track play state from libVLC events instead of querying the player
+            events = self.vlc_player.event_manager()
+            events.event_attach(vlc.EventType.MediaPlayerPlaying, lambda event: self.playback_changed.emit(True))
+            for event_type in (vlc.EventType.MediaPlayerPaused, vlc.EventType.MediaPlayerStopped,
+                               vlc.EventType.MediaPlayerEndReached):
+                events.event_attach(event_type, lambda event: self.playback_changed.emit(False))
+            
+            # Create video frame widget; a native, opaque window that VLC draws
+            # to directly instead of going through Qt's backing store
+            self.video_frame = QWidget()
+            self.video_frame.setAttribute(Qt.WA_NativeWindow, True)
+            self.video_frame.setAttribute(Qt.WA_PaintOnScreen, True)
+            self.video_frame.setAttribute(Qt.WA_OpaquePaintEvent, True)
+            self.video_frame.setAutoFillBackground(False)
+            self.video_frame.setStyleSheet('border: 2px solid #ccc; background: #000;')
+            self.video_frame.setMinimumHeight(400)
+            self.step4_player_layout.addWidget(self.video_frame)
+        else:
+            # Fallback to static thumbnail if VLC not available
+            self.step4_thumbnail = QLabel()
+            self.step4_thumbnail.setAlignment(Qt.AlignCenter)
+            self.step4_thumbnail.setStyleSheet('border: 2px solid #ccc; background: #000; color: #fff; padding: 20px;')
+            self.step4_thumbnail.setMinimumHeight(350)
+            self.step4_thumbnail.setWordWrap(True)
+            self.step4_thumbnail.setText(
+                '⚠️ Live Video Preview Unavailable\n\n'
+                'VLC media player is required for live video playback.\n\n'
+                'Using static thumbnail preview instead.\n'
+                'Click "Install VLC" below to enable live preview.'
+            )
+            self.step4_player_layout.addWidget(self.step4_thumbnail)
+            
+            # Install VLC button
+            install_vlc_btn = QPushButton('📥 Install VLC Media Player')
+            self.style_button(install_vlc_btn, '#ff9800')
+            install_vlc_btn.clicked.connect(self.install_vlc)
+            self.step4_player_layout.addWidget(install_vlc_btn)
+    
     def toggle_playback(self):
         """Toggle play/pause for video preview"""
-        if not VLC_AVAILABLE or not self.vlc_player:
+        if not self.vlc_player:
             return
         
-        if self.vlc_player.is_playing():
+        # The button follows the player through playback_changed
+        if self._vlc_playing:
             self.vlc_player.pause()
-            self.play_pause_btn.setText('▶️ Play')
         else:
             self.vlc_player.play()
-            self.play_pause_btn.setText('⏸️ Pause')
     
     def stop_playback(self):
         """Stop video playback"""
-        if not VLC_AVAILABLE or not self.vlc_player:
+        if not self.vlc_player:
             return
         
         self.vlc_player.stop()
-        self.play_pause_btn.setText('▶️ Play')
+    
+    def _on_playback_changed(self, playing):
+        """Sync the play/pause button with the player's state"""
+        self._vlc_playing = playing
+        self.play_pause_btn.setText('⏸️ Pause' if playing else '▶️ Play')
     
     def install_vlc(self):
         """Install VLC Media Player"""
@@ -1489,26 +2193,10 @@ class WizardEditor(QWidget):
         progress.setValue(0)
         progress.show()
         
-        # Install in background thread
-        class InstallThread(QThread):
-            finished_signal = pyqtSignal(bool, str)
-            
-            def run(self):
-                try:
-                    success, message = do_install_vlc()
-                    self.finished_signal.emit(success, message)
-                except Exception as e:
-                    self.finished_signal.emit(False, str(e))
-        
+        # Install on the global thread pool; the result comes back through a signal
         def on_install_complete(success, message):
             progress.close()
             
-            # Clean up thread
-            if hasattr(self, 'install_thread'):
-                self.install_thread.wait()
-                self.install_thread.deleteLater()
-                self.install_thread = None
-            
             if success:
                 QMessageBox.information(
                     self,
@@ -1525,24 +2213,16 @@ class WizardEditor(QWidget):
                     'Please install VLC manually from:\nhttps://www.videolan.org/vlc/'
                 )
         
-        self.install_thread = InstallThread()
-        self.install_thread.finished_signal.connect(on_install_complete)
-        self.install_thread.start()
+        self._install_signals = InstallSignals()
+        self._install_signals.finished.connect(on_install_complete)
+        QThreadPool.globalInstance().start(InstallWorker(do_install_vlc, self._install_signals))
     
     def open_external_player(self):
         """Open video in system's default player"""
         preview_video = self.current_project.get('final_video')
         if preview_video and os.path.exists(preview_video):
-            import subprocess
-            import platform
-            
             try:
-                if platform.system() == 'Windows':
-                    os.startfile(preview_video)
-                elif platform.system() == 'Darwin':  # macOS
-                    subprocess.call(['open', preview_video])
-                else:  # Linux
-                    subprocess.call(['xdg-open', preview_video])
+                open_with_default_app(preview_video)
             except Exception as e:
                 QMessageBox.warning(self, 'Error', f'Could not open video:\n{str(e)}')
         else:
@@ -1556,10 +2236,47 @@ class WizardEditor(QWidget):
         if folder:
             self.export_folder.setText(folder)
     
+    def single_pass_sources(self):
+        """Source files and settings for a single-pass export, or None if unavailable"""
+        # Same base video as the step-by-step path: the overlay background, or
+        # the video next_step passes through when there is no overlay
+        if self.overlay_enable.isChecked():
+            background = self.bg_video_combo.currentData()
+        else:
+            background = self.base_source_video()
+        if not background or not os.path.exists(background):
+            return None
+        
+        params = {'background': background}
+        if self.overlay_enable.isChecked():
+            overlay = self.overlay_video_combo.currentData()
+            if not overlay or overlay == background or not os.path.exists(overlay):
+                return None
+            params.update(
+                overlay=overlay,
+                x_percent=self.overlay_x_spin.value(),
+                y_percent=self.overlay_y_spin.value(),
+                size=self.size_slider.value() / 100.0
+            )
+        if self.watermark_enable.isChecked():
+            watermark = self.watermark_path.text()
+            if not watermark or not os.path.exists(watermark):
+                return None
+            params.update(
+                watermark=watermark,
+                position=self.wm_position_combo.currentText().lower().replace(' ', '_'),
+                opacity=self.opacity_slider.value() / 100.0
+            )
+        return params
+    
     def export_final(self):
         """Export final video"""
         final_video = self.current_project.get('final_video')
-        if not final_video or not os.path.exists(final_video):
+        # The watermark step already produced a file - reuse it rather than re-render
+        sources = None
+        if self.single_pass_check.isChecked() and not self.current_project.get('watermark_rendered'):
+            sources = self.single_pass_sources()
+        if sources is None and (not final_video or not os.path.exists(final_video)):
             QMessageBox.warning(self, 'No Video', 'No video ready for export. Complete previous steps first.')
             return
         
@@ -1584,13 +2301,23 @@ class WizardEditor(QWidget):
         self.export_log.append(f"Starting export to: {output_path}")
         self.show_processing("Exporting video...")
         
-        self.processor = VideoProcessor(
-            self.ffmpeg_path,
-            'export',
-            input=final_video,
-            output=output_path,
-            quality=quality
-        )
+        if sources is not None:
+            self.export_log.append("Rendering overlay, watermark and export in a single pass")
+            self.processor = VideoProcessor(
+                self.ffmpeg_path,
+                'final',
+                output=output_path,
+                quality=quality,
+                **sources
+            )
+        else:
+            self.processor = VideoProcessor(
+                self.ffmpeg_path,
+                'export',
+                input=final_video,
+                output=output_path,
+                quality=quality
+            )
         self.processor.progress_update.connect(self.update_progress)
         self.processor.processing_complete.connect(self.export_complete)
         self.processor.start()
@@ -1856,9 +2583,159 @@ class WizardEditor(QWidget):
     
     # ===== Live Preview Methods =====
     
+    # Number of decoded frames kept for previews
+    FRAME_CACHE_SIZE = 16
+    
+    SCALED_PIXMAP_CACHE_SIZE = 8
+    
+    def scaled_frame_pixmap(self, frame, size):
+        """Frame scaled to fit size as a pixmap, reused while the frame and size are unchanged
+        
+        Scales the QImage before converting, so no full-resolution pixmap is made.
+        """
+        key = (frame.cacheKey(), size.width(), size.height())
+        pixmap = self._scaled_pixmaps.get(key)
+        if pixmap is None:
+            if len(self._scaled_pixmaps) >= self.SCALED_PIXMAP_CACHE_SIZE:
+                del self._scaled_pixmaps[next(iter(self._scaled_pixmaps))]
+            pixmap = QPixmap.fromImage(frame.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self._scaled_pixmaps[key] = pixmap
+        return pixmap
+    
+    def _frame_key(self, video_path, timestamp):
+        """Cache key for a frame, or None if the file is missing"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        if timestamp is not None:
+            timestamp = round(timestamp, 3)
+        return (video_path, stat.st_mtime_ns, stat.st_size, timestamp)
+    
+    def _cached_frame(self, key):
+        """Cached frame for key, marked as most recently used; None on a miss"""
+        frame = self._frame_cache.get(key)
+        if frame is not None:
+            self._frame_cache.move_to_end(key)
+        return frame
+    
+    def _store_frame(self, key, frame):
+        if len(self._frame_cache) >= self.FRAME_CACHE_SIZE:
+            # Drop the least recently used entry
+            self._frame_cache.popitem(last=False)
+        self._frame_cache[key] = frame
+    
     def extract_video_frame(self, video_path, timestamp=1.0):
+        """Extract a frame from video, decoding each file/timestamp only once"""
+        key = self._frame_key(video_path, timestamp)
+        if key is None:
+            return None
+        frame = self._cached_frame(key)
+        if frame is not None:
+            return frame
+        
+        frame = self._decode_video_frame(video_path, timestamp)
+        if frame is not None:
+            self._store_frame(key, frame)
+        return frame
+    
+    def cached_video_frame(self, video_path, on_ready, timestamp=1.0):
+        """Return an already decoded frame without blocking the GUI
+        
+        Returns FRAME_PENDING and decodes on the thread pool when the frame isn't
+        cached yet; on_ready() is then called on the GUI thread once it is.
+        Returns None if the file is missing or can't be decoded.
+        """
+        key = self._frame_key(video_path, timestamp)
+        if key is None or key in self._frame_failed:
+            return None
+        frame = self._cached_frame(key)
+        if frame is not None:
+            return frame
+        
+        callbacks = self._frame_pending.get(key)
+        if callbacks is None:
+            self._frame_pending[key] = [on_ready]
+            QThreadPool.globalInstance().start(FrameWorker(self._decode_video_frame, key, self._frame_signals))
+        else:
+            callbacks.append(on_ready)
+        return FRAME_PENDING
+    
+    def _on_frame_ready(self, key, frame):
+        """Store a frame decoded in the background and notify whoever asked for it"""
+        if frame is None:
+            self._frame_failed.add(key)
+        else:
+            self._store_frame(key, frame)
+        for on_ready in self._frame_pending.pop(key, ()):
+            on_ready()
+    
+    def _decode_video_frame(self, video_path, timestamp):
+        """Extract a frame with NVDEC when available, otherwise with PyAV, FFmpeg or OpenCV"""
+        if has_cuda_hwaccel(self.ffmpeg_path):
+            frame = self._grab_thumbnail(video_path, timestamp)
+            if frame is not None:
+                return frame
+        if av is not None:
+            frame = self._decode_video_frame_av(video_path, timestamp)
+            if frame is not None:
+                return frame
+        # FFmpeg seeks on the input; OpenCV decodes its way to the frame
+        frame = self._grab_thumbnail(video_path, timestamp, hwaccel=False)
+        if frame is not None:
+            return frame
+        return self._decode_video_frame_cv2(video_path, timestamp)
+    
+    def _decode_video_frame_av(self, video_path, timestamp):
+        """Extract a frame from video using PyAV"""
+        try:
+            with av.open(video_path) as container:
+                stream = container.streams.video[0]
+                stream.thread_type = 'AUTO'
+                # Seek lands on the keyframe before timestamp; decode forward from there
+                container.seek(int(timestamp / stream.time_base), stream=stream)
+                frame = None
+                for frame in container.decode(stream):
+                    if frame.time is None or frame.time >= timestamp:
+                        break
+                if frame is None:
+                    return None
+                frame_rgb = frame.to_ndarray(format='rgb24')
+            
+            height, width, channel = frame_rgb.shape
+            q_image = QImage(frame_rgb.data, width, height, frame_rgb.strides[0], QImage.Format_RGB888)
+            # Detach from the numpy buffer so the cached image owns its pixels
+            return q_image.copy()
+        except Exception as e:
+            logging.warning(f"PyAV could not decode {video_path}: {e}")
+            return None
+    
+    def _grab_thumbnail(self, video_path, timestamp, hwaccel=True):
+        """Decode one frame with FFmpeg (on the GPU if hwaccel), seeking before the input so only one GOP is decoded"""
+        command = [
+            resolve_executable(self.ffmpeg_path), '-hide_banner', '-loglevel', 'error',
+            *(['-hwaccel', 'cuda'] if hwaccel else []),
+            '-ss', str(timestamp), '-i', video_path,
+            '-frames:v', '1',
+            # Uncompressed BMP: nothing to encode or decode on either end of the pipe
+            '-f', 'image2pipe', '-vcodec', 'bmp', '-'
+        ]
+        try:
+            result = subprocess.run(command, capture_output=True, timeout=15,
+                                    creationflags=_CREATE_NO_WINDOW, **SPAWN_KWARGS)
+        except Exception as e:
+            logging.warning(f"FFmpeg thumbnail failed: {e}")
+            return None
+        if result.returncode != 0 or not result.stdout:
+            return None
+        image = QImage.fromData(result.stdout, 'BMP')
+        return None if image.isNull() else image
+    
+    def _decode_video_frame_cv2(self, video_path, timestamp):
         """Extract a frame from video using OpenCV"""
         try:
+            # Imported here: OpenCV is a large library that is only needed as a fallback
+            import cv2
             cap = cv2.VideoCapture(video_path)
             if not cap.isOpened():
                 return None
@@ -1872,12 +2749,14 @@ class WizardEditor(QWidget):
             cap.release()
             
             if ret:
-                # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                height, width, channel = frame_rgb.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(frame_rgb.data, width, height, bytes_per_line, QImage.Format_RGB888)
-                return q_image
+                if _QIMAGE_BGR888 is None:
+                    # Qt < 5.14 has no BGR format - convert BGR to RGB
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                height, width, channel = frame.shape
+                q_image = QImage(frame.data, width, height, frame.strides[0],
+                                 _QIMAGE_BGR888 or QImage.Format_RGB888)
+                # Detach from the numpy buffer so the cached image owns its pixels
+                return q_image.copy()
             
             return None
         except Exception as e:
@@ -1886,20 +2765,24 @@ class WizardEditor(QWidget):
     
     def show_video_preview_step1(self, item):
         """Show preview thumbnail for selected video in Step 1"""
+        filepath = item.data(Qt.UserRole)
+        if not filepath or not os.path.exists(filepath):
+            return
+        self._step1_request += 1
+        self._show_step1_preview(filepath, self._step1_request)
+    
+    def _show_step1_preview(self, filepath, request_id):
+        """Show the Step 1 thumbnail once its frame is decoded, unless a newer click superseded it"""
+        if request_id != self._step1_request:
+            return
         try:
-            filepath = item.data(Qt.UserRole)
-            if not filepath or not os.path.exists(filepath):
+            frame = self.cached_video_frame(
+                filepath, lambda: self._show_step1_preview(filepath, request_id))
+            if frame is FRAME_PENDING:
+                self.step1_preview_label.setText('Loading preview...')
                 return
-            
-            # Extract frame
-            frame = self.extract_video_frame(filepath)
             if frame:
-                pixmap = QPixmap.fromImage(frame)
-                self.step1_preview_label.setPixmap(pixmap.scaled(
-                    self.step1_preview_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                ))
+                self.step1_preview_label.setPixmap(self.scaled_frame_pixmap(frame, self.step1_preview_label.size()))
                 
                 # Show file info
                 file_size = os.path.getsize(filepath) / (1024 * 1024)
@@ -1911,20 +2794,21 @@ class WizardEditor(QWidget):
             self.step1_preview_label.setText('Preview unavailable')
     
     def update_overlay_preview(self):
+        """Schedule a Step 2 preview redraw; rapid changes collapse into one"""
+        self._preview_timer.start(50)
+    
+    def _do_update_overlay_preview(self):
         """Update live preview for Step 2 overlay"""
         try:
             if not self.overlay_enable.isChecked():
                 # Just show background video
                 bg_video = self.bg_video_combo.currentData()
                 if bg_video and os.path.exists(bg_video):
-                    frame = self.extract_video_frame(bg_video)
-                    if frame:
-                        pixmap = QPixmap.fromImage(frame)
-                        self.overlay_preview_label.setPixmap(pixmap.scaled(
-                            self.overlay_preview_label.size(),
-                            Qt.KeepAspectRatio,
-                            Qt.SmoothTransformation
-                        ))
+                    frame = self.cached_video_frame(bg_video, self.update_overlay_preview)
+                    if frame is FRAME_PENDING:
+                        self.overlay_preview_label.setText('Loading preview...')
+                    elif frame:
+                        self.overlay_preview_label.setPixmap(self.scaled_frame_pixmap(frame, self.overlay_preview_label.size()))
                         self.overlay_preview_label.set_overlay_rect(None)
                 return
             
@@ -1936,66 +2820,72 @@ class WizardEditor(QWidget):
                 self.overlay_preview_label.set_overlay_rect(None)
                 return
             
-            # Extract frames
-            bg_frame = self.extract_video_frame(bg_video)
-            overlay_frame = self.extract_video_frame(overlay_video)
+            # Extract frames (decoded in the background on first use)
+            bg_frame = self.cached_video_frame(bg_video, self.update_overlay_preview)
+            overlay_frame = self.cached_video_frame(overlay_video, self.update_overlay_preview)
+            
+            if bg_frame is FRAME_PENDING or overlay_frame is FRAME_PENDING:
+                self.overlay_preview_label.setText('Loading preview...')
+                self.overlay_preview_label.set_overlay_rect(None)
+                return
             
             if not bg_frame or not overlay_frame:
                 self.overlay_preview_label.setText('Could not load video frames')
                 self.overlay_preview_label.set_overlay_rect(None)
                 return
             
-            # Create composite image
-            bg_pixmap = QPixmap.fromImage(bg_frame)
-            overlay_pixmap = QPixmap.fromImage(overlay_frame)
+            # Compose at display resolution: each redraw only touches the label's
+            # pixels, and the scaled background is reused while the overlay moves
+            bg_size = bg_frame.size()
+            label_size = self.overlay_preview_label.size()
+            scaled_bg = self.scaled_frame_pixmap(bg_frame, label_size)
             
-            # Calculate overlay size (keep aspect ratio)
-            size_percent = self.size_slider.value() / 100.0
-            overlay_width = int(bg_pixmap.width() * size_percent)
-            overlay_height = int(bg_pixmap.height() * size_percent)
+            # Calculate scale factor
+            scale_x = scaled_bg.width() / bg_size.width()
+            scale_y = scaled_bg.height() / bg_size.height()
             
-            overlay_pixmap = overlay_pixmap.scaled(overlay_width, overlay_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            # Calculate overlay size in video pixels (keep aspect ratio)
+            size_percent = self.size_slider.value() / 100.0
+            overlay_size = overlay_frame.size().scaled(
+                int(bg_size.width() * size_percent),
+                int(bg_size.height() * size_percent),
+                Qt.KeepAspectRatio
+            )
             
             # Use X/Y percentage positions
             x_percent = self.overlay_x_spin.value() / 100.0
             y_percent = self.overlay_y_spin.value() / 100.0
             
-            x = int(x_percent * (bg_pixmap.width() - overlay_pixmap.width()))
-            y = int(y_percent * (bg_pixmap.height() - overlay_pixmap.height()))
+            x = int(x_percent * (bg_size.width() - overlay_size.width()))
+            y = int(y_percent * (bg_size.height() - overlay_size.height()))
+            
+            # Overlay position and size on screen
+            draw_x = int(x * scale_x)
+            draw_y = int(y * scale_y)
+            scaled_width = max(1, int(overlay_size.width() * scale_x))
+            scaled_height = max(1, int(overlay_size.height() * scale_y))
+            overlay_pixmap = QPixmap.fromImage(overlay_frame.scaled(
+                scaled_width, scaled_height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
             
             # Draw overlay on background
-            from PyQt5.QtCore import QRect
-            composite = QPixmap(bg_pixmap)
-            painter = QPainter(composite)
+            scaled_pixmap = QPixmap(scaled_bg)
+            painter = QPainter(scaled_pixmap)
             
             # Draw semi-transparent border around overlay for visibility
-            pen = QPen(Qt.yellow, 3)
+            pen = QPen(Qt.yellow, 2)
             painter.setPen(pen)
-            painter.drawRect(x-2, y-2, overlay_pixmap.width()+4, overlay_pixmap.height()+4)
+            painter.drawRect(draw_x-2, draw_y-2, scaled_width+4, scaled_height+4)
             
-            painter.drawPixmap(x, y, overlay_pixmap)
+            painter.drawPixmap(draw_x, draw_y, overlay_pixmap)
             painter.end()
             
-            # Calculate scaled dimensions for display
-            label_size = self.overlay_preview_label.size()
-            scaled_pixmap = composite.scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            
-            # Calculate scale factor
-            scale_x = scaled_pixmap.width() / composite.width()
-            scale_y = scaled_pixmap.height() / composite.height()
-            
             # Calculate offset (for centering when aspect ratios don't match)
             x_offset = (label_size.width() - scaled_pixmap.width()) // 2
             y_offset = (label_size.height() - scaled_pixmap.height()) // 2
             
             # Store overlay rect in SCALED coordinates for dragging
-            scaled_x = int(x * scale_x) + x_offset
-            scaled_y = int(y * scale_y) + y_offset
-            scaled_width = int(overlay_pixmap.width() * scale_x)
-            scaled_height = int(overlay_pixmap.height() * scale_y)
-            
-            overlay_rect = QRect(scaled_x, scaled_y, scaled_width, scaled_height)
-            self.overlay_preview_label.set_overlay_rect(overlay_rect, self.overlay_scale_info)
+            scaled_x = draw_x + x_offset
+            scaled_y = draw_y + y_offset
             
             # Store scale info for reverse calculation during dragging
             self.overlay_scale_info = {
@@ -2003,12 +2893,15 @@ class WizardEditor(QWidget):
                 'scale_y': scale_y,
                 'x_offset': x_offset,
                 'y_offset': y_offset,
-                'bg_width': bg_pixmap.width(),
-                'bg_height': bg_pixmap.height(),
-                'overlay_width': overlay_pixmap.width(),
-                'overlay_height': overlay_pixmap.height()
+                'bg_width': bg_size.width(),
+                'bg_height': bg_size.height(),
+                'overlay_width': overlay_size.width(),
+                'overlay_height': overlay_size.height()
             }
             
+            overlay_rect = QRect(scaled_x, scaled_y, scaled_width, scaled_height)
+            self.overlay_preview_label.set_overlay_rect(overlay_rect, self.overlay_scale_info)
+            
             # Display composite
             self.overlay_preview_label.setPixmap(scaled_pixmap)
             
@@ -2045,7 +2938,27 @@ class WizardEditor(QWidget):
         """Regenerate preview when dragging is complete"""
         self.update_overlay_preview()
     
+    def prepared_watermark(self, watermark_path, max_width):
+        """Load and scale the watermark once; opacity and position changes reuse it"""
+        try:
+            key = (watermark_path, os.stat(watermark_path).st_mtime_ns, max_width)
+        except OSError:
+            return None
+        cached_key, pixmap = self._watermark_pixmap
+        if cached_key != key:
+            pixmap = QPixmap(watermark_path)
+            if pixmap.isNull():
+                pixmap = None
+            elif pixmap.width() > max_width:
+                pixmap = pixmap.scaledToWidth(max_width, Qt.SmoothTransformation)
+            self._watermark_pixmap = (key, pixmap)
+        return pixmap
+    
     def update_watermark_preview(self):
+        """Schedule a Step 3 preview redraw; rapid changes collapse into one"""
+        self._watermark_timer.start(50)
+    
+    def _do_update_watermark_preview(self):
         """Update live preview for Step 3 watermark"""
         try:
             if not self.watermark_enable.isChecked():
@@ -2066,25 +2979,23 @@ class WizardEditor(QWidget):
                 self.watermark_preview_label.setText('No video available')
                 return
             
-            # Extract video frame
-            video_frame = self.extract_video_frame(input_video)
+            # Extract video frame; redraw once it is decoded in the background
+            video_frame = self.cached_video_frame(input_video, self.update_watermark_preview)
+            if video_frame is FRAME_PENDING:
+                self.watermark_preview_label.setText('Loading preview...')
+                return
             if not video_frame:
                 self.watermark_preview_label.setText('Could not load video')
                 return
             
             video_pixmap = QPixmap.fromImage(video_frame)
             
-            # Load watermark
-            watermark_pixmap = QPixmap(watermark_path)
-            if watermark_pixmap.isNull():
+            # Load watermark, scaled to max 20% of video size
+            watermark_pixmap = self.prepared_watermark(watermark_path, int(video_pixmap.width() * 0.2))
+            if watermark_pixmap is None:
                 self.watermark_preview_label.setText('Invalid watermark image')
                 return
             
-            # Scale watermark (max 20% of video size)
-            max_wm_size = int(video_pixmap.width() * 0.2)
-            if watermark_pixmap.width() > max_wm_size:
-                watermark_pixmap = watermark_pixmap.scaledToWidth(max_wm_size, Qt.SmoothTransformation)
-            
             # Apply opacity
             opacity = self.opacity_slider.value() / 100.0
             
@@ -0,0 +1,228 @@
+"""
+Unit Tests for Hallmark Record Helpers
+Checks the pure helper functions that don't need FFmpeg or a GUI
+"""
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_config_defaults():
+    """Test merging saved configs with the defaults"""
+    print("Testing Config Defaults...")
+    
+    from config_manager import ConfigManager
+    
+    config = ConfigManager(os.path.join(tempfile.mkdtemp(), 'config.json'))
+    
+    # A fresh default config is complete
+    defaults = config.default_config()
+    assert config.has_all_default_keys(defaults)
+    print("  ✓ Default config has every key")
+    
+    # Missing sections and keys are detected
+    partial = config.default_config()
+    del partial['watermark']['opacity']
+    assert not config.has_all_default_keys(partial)
+    del partial['upload']
+    assert not config.has_all_default_keys(partial)
+    old_version = config.default_config()
+    old_version['version'] = '0.9'
+    assert not config.has_all_default_keys(old_version)
+    print("  ✓ Missing keys and old versions detected")
+    
+    # Merging fills in defaults but keeps the user's values
+    merged = config.merge_with_defaults({
+        'watermark': {'enabled': True},
+        'export': {'default_quality': 'low'},
+        'custom': {'key': 1}
+    })
+    assert merged['watermark']['enabled'] is True
+    assert merged['watermark']['opacity'] == 0.7
+    assert merged['export']['default_quality'] == 'low'
+    assert merged['export']['export_format'] == 'mp4'
+    assert merged['custom'] == {'key': 1}
+    assert config.has_all_default_keys(merged)
+    print("  ✓ Merge keeps user values and fills defaults")
+    
+    # Merged configs don't share dicts with the defaults
+    merged['recording']['default_quality'] = 'low'
+    assert config.default_config()['recording']['default_quality'] == 'high'
+    print("  ✓ Merged config is independent of the defaults")
+    
+    print("✓ Config default tests passed!\n")
+    return True
+
+
+def test_concat_entry():
+    """Test concat demuxer list lines"""
+    print("Testing Concat Entries...")
+    
+    from editor import video_editor, wizard_editor
+    
+    base = os.path.abspath('videos')
+    for concat_entry in (video_editor.concat_entry, wizard_editor.concat_entry):
+        # Relative paths are made absolute
+        assert concat_entry('clip.mp4') == f"file '{os.path.abspath('clip.mp4')}'\n"
+        # Single quotes are closed, escaped and reopened
+        assert concat_entry(os.path.join(base, "it's.mp4")) == f"file '{base}{os.sep}it'\\''s.mp4'\n"
+    print("  ✓ Paths are absolute and quotes escaped")
+    
+    print("✓ Concat entry tests passed!\n")
+    return True
+
+
+def test_escape_drawtext():
+    """Test escaping free text for drawtext"""
+    print("Testing drawtext Escaping...")
+    
+    from editor.video_editor import escape_drawtext
+    
+    assert escape_drawtext('Hello World') == 'Hello World'
+    assert escape_drawtext('a[b],c;d') == r'a\[b\]\,c\;d'
+    assert escape_drawtext("it's 10:30") == r"it\\\'s 10\\:30"
+    assert escape_drawtext('50% off') == '50' + '\\' * 4 + '% off'
+    assert escape_drawtext('back\\slash') == 'back' + '\\' * 8 + 'slash'
+    print("  ✓ Filtergraph, option and expansion characters escaped")
+    
+    print("✓ drawtext escaping tests passed!\n")
+    return True
+
+
+def test_parse_request():
+    """Test JSON request validation"""
+    print("Testing Request Parsing...")
+    
+    from editor.video_editor import app, parse_request, RequestError, TrimReq, MergeReq
+    
+    def parse(cls, payload):
+        with app.test_request_context(json=payload):
+            return parse_request(cls)[0]
+    
+    def rejects(cls, payload):
+        try:
+            parse(cls, payload)
+        except RequestError:
+            return True
+        return False
+    
+    req = parse(TrimReq, {'session': 's', 'filename': 'a.mp4', 'start_time': 1, 'end_time': 2.5})
+    assert (req.session, req.filename, req.start_time, req.end_time) == ('s', 'a.mp4', 1, 2.5)
+    print("  ✓ Valid request parsed")
+    
+    req = parse(MergeReq, {'session': 's', 'files': ['a.mp4'], 'unknown': True})
+    assert req.output_name == 'merged_output.mp4' and req.layout == 'grid'
+    print("  ✓ Defaults applied and unknown keys ignored")
+    
+    assert rejects(TrimReq, {'session': 's', 'filename': 'a.mp4', 'start_time': 1})
+    assert rejects(TrimReq, {'session': 's', 'filename': 'a.mp4', 'start_time': '1', 'end_time': 2})
+    assert rejects(TrimReq, {'session': 's', 'filename': 'a.mp4', 'start_time': True, 'end_time': 2})
+    assert rejects(MergeReq, {'session': 's', 'files': 'a.mp4'})
+    assert rejects(TrimReq, ['not', 'an', 'object'])
+    print("  ✓ Missing fields, wrong types and non-objects rejected")
+    
+    print("✓ Request parsing tests passed!\n")
+    return True
+
+
+def test_session_paths():
+    """Test that session and file names can't escape the outputs folder"""
+    print("Testing Session Paths...")
+    
+    from editor.video_editor import _session_dir, _session_file, RequestError, OUTPUTS_DIR
+    
+    def rejects(func, *args):
+        try:
+            func(*args)
+        except RequestError:
+            return True
+        return False
+    
+    session_path = _session_dir('session_test')
+    assert session_path == os.path.realpath(os.path.join(OUTPUTS_DIR, 'session_test'))
+    assert rejects(_session_dir, '..')
+    assert rejects(_session_dir, 'session_test/../../elsewhere')
+    assert rejects(_session_dir, '.')
+    print("  ✓ Session names stay inside the outputs folder")
+    
+    assert _session_file(session_path, 'clip.mp4') == os.path.join(session_path, 'clip.mp4')
+    assert _session_file(session_path, 'sub/../clip.mp4') == os.path.join(session_path, 'clip.mp4')
+    assert rejects(_session_file, session_path, '../other/clip.mp4')
+    assert rejects(_session_file, session_path, os.path.join('..', '..', 'clip.mp4'))
+    assert rejects(_session_file, session_path, '.')
+    print("  ✓ File names stay inside the session folder")
+    
+    print("✓ Session path tests passed!\n")
+    return True
+
+
+def test_layout_filters():
+    """Test the merge layout filter table"""
+    print("Testing Layout Filters...")
+    
+    from editor.wizard_editor import LAYOUT_FILTERS, VideoProcessor
+    
+    assert LAYOUT_FILTERS[('side_by_side', 3)] == '[0:v][1:v][2:v]hstack=inputs=3[v]'
+    assert LAYOUT_FILTERS[('grid', 3)] == '[0:v][1:v][2:v]xstack=inputs=3:layout=0_0|w0_0|0_h0:fill=black[v]'
+    assert LAYOUT_FILTERS[('grid', 6)].endswith(':layout=0_0|w0_0|w0+w1_0|0_h0|w3_h0|w3+w4_h0:fill=black[v]')
+    print("  ✓ hstack and xstack graphs built")
+    
+    for (layout, count), graph in LAYOUT_FILTERS.items():
+        # Every input is used and the graph ends in the [v] output
+        assert all(f'[{i}:v]' in graph for i in range(count)), (layout, count)
+        assert graph.endswith('[v]'), (layout, count)
+    print("  ✓ Every graph uses all inputs and outputs [v]")
+    
+    processor = VideoProcessor('ffmpeg', 'merge', encoder={})
+    assert processor.build_layout_filter(['a', 'b', 'c', 'd'], 'grid') == LAYOUT_FILTERS[('grid', 4)]
+    assert processor.build_layout_filter(['a', 'b', 'c', 'd', 'e'], 'grid') is None
+    assert processor.build_layout_filter(['a'] * 5, 'side_by_side') is None
+    print("  ✓ Unsupported combinations return None")
+    
+    print("✓ Layout filter tests passed!\n")
+    return True
+
+
+def run_all_tests():
+    """Run all helper tests"""
+    print("=" * 60)
+    print("HALLMARK RECORD - Helper Tests")
+    print("=" * 60)
+    print()
+    
+    tests = [
+        ("Config Defaults", test_config_defaults),
+        ("Concat Entries", test_concat_entry),
+        ("drawtext Escaping", test_escape_drawtext),
+        ("Request Parsing", test_parse_request),
+        ("Session Paths", test_session_paths),
+        ("Layout Filters", test_layout_filters),
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+            else:
+                failed += 1
+                print(f"✗ {name} failed\n")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name} failed with exception: {e}\n")
+    
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+    
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)